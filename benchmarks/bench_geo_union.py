@@ -0,0 +1,107 @@
+"""Benchmark geo_union against the serial shapely/geopandas unions
+
+Builds overlapping buffered points around Lyon and, for each size:
+
+- times shapely.union_all and parallel_union, and checks with same_union
+  that both give the same parts and vertices (to UNION_TOLERANCE);
+- times GeoDataFrame.dissolve and dissolve_by on --groups groups of skewed
+  sizes (a few groups larger than the partition size, many small ones),
+  and checks every group the same way.
+
+With a single core (or --workers 1) parallel_union falls back to the
+serial union, so the timings only compare the engines on multi-core hosts.
+
+Usage (from the repository root):
+    python benchmarks/bench_geo_union.py --features 20000 100000 --workers 4
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import geo_union  # noqa: E402
+
+# Bounding box of the Lyon metropolitan area
+LON_RANGE = (4.70, 5.00)
+LAT_RANGE = (45.60, 45.90)
+
+# Buffer radius range, in degrees
+RADIUS_RANGE = (0.001, 0.004)
+
+
+def make_polygons(count, seed):
+    """Buffered points, dense enough for most of them to overlap"""
+    rng = np.random.default_rng(seed)
+    points = shapely.points(rng.uniform(*LON_RANGE, count), rng.uniform(*LAT_RANGE, count))
+    return shapely.buffer(points, rng.uniform(*RADIUS_RANGE, count))
+
+
+def make_frame(polygons, groups, seed):
+    """GeoDataFrame with a skewed "groupe" column (Zipf-like group sizes)"""
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, groups + 1)
+    codes = rng.choice(groups, size=len(polygons), p=weights / weights.sum())
+    return gpd.GeoDataFrame({"groupe": codes}, geometry=polygons, crs="EPSG:4326")
+
+
+def timed(func):
+    """Wall-clock time of one call, and its result"""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--features", type=int, nargs="+", default=[20_000])
+    parser.add_argument("--groups", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--partition-size", type=int, default=geo_union.DEFAULT_PARTITION_SIZE)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for count in args.features:
+        polygons = make_polygons(count, args.seed)
+
+        serial_time, expected = timed(lambda: shapely.union_all(polygons))
+        parallel_time, (result, timings) = timed(
+            lambda: geo_union.parallel_union(polygons, args.workers, args.partition_size)
+        )
+        same = geo_union.same_union(result, expected)
+        failures += not same
+
+        print(f"{count} polygons:")
+        print(f"  union_all:       {serial_time:6.2f} s")
+        print(f"  parallel_union:  {parallel_time:6.2f} s  ({', '.join(timings)})")
+        print(f"  same_union:      {same}")
+
+        gdf = make_frame(polygons, args.groups, args.seed)
+        dissolve_time, expected = timed(lambda: gdf.dissolve("groupe"))
+        by_time, (result, timings) = timed(
+            lambda: geo_union.dissolve_by(gdf, "groupe", None, args.workers, args.partition_size)
+        )
+        result = result.set_index("groupe").loc[expected.index]
+        matching = sum(
+            geo_union.same_union(a, b)
+            for a, b in zip(result.geometry, expected.geometry)
+        )
+        failures += matching != len(expected)
+
+        print(f"  dissolve:        {dissolve_time:6.2f} s")
+        print(f"  dissolve_by:     {by_time:6.2f} s  ({', '.join(timings)})")
+        print(f"  same_union:      {matching}/{len(expected)} groups")
+
+    if failures:
+        raise SystemExit(f"{failures} union(s) differ from the serial result")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark coordinate validation in geovalidation
+
+Writes a synthetic FeatureCollection of Point features (a few of them
+invalid) and reports, for each size:
+
+- parsing alone (iter_features);
+- validation alone (clean_coordinate_data) on already parsed features;
+- parsing plus validation, as stream_clean_features does;
+- what the parent process of a worker pool would spend just pickling
+  the work: whole features, or only their geometries.
+
+Usage (from the repository root):
+    python benchmarks/bench_geovalidation.py --features 100000 300000
+"""
+
+import argparse
+import pickle
+import sys
+import tempfile
+import time
+from operator import itemgetter
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import geovalidation  # noqa: E402
+
+# One feature in INVALID_EVERY is out of range
+INVALID_EVERY = 100
+
+
+def write_points(file, count, seed):
+    """Write `count` Point features with properties, as the open data exports do"""
+    rng = np.random.default_rng(seed)
+    lon = rng.uniform(4.65, 5.10, count).round(6)
+    lat = rng.uniform(45.55, 45.95, count).round(6)
+    lat[::INVALID_EVERY] = 95.0
+    with geovalidation.FeatureCollectionWriter(file) as writer:
+        for i in range(count):
+            writer.write({
+                "type": "Feature",
+                "properties": {"id": i, "code": f"X{i}", "nom": f"Arret {i}"},
+                "geometry": {"type": "Point", "coordinates": [lon[i], lat[i]]},
+            })
+
+
+def pickle_features(features):
+    """Bytes a worker pool would receive when sent whole features"""
+    return len(pickle.dumps(features, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def pickle_geometries(features):
+    """Bytes a worker pool would receive when sent only the geometries"""
+    geometries = list(map(itemgetter("geometry"), features))
+    return len(pickle.dumps(geometries, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def per_feature(features):
+    """Issues from clean_coordinate_data, one feature at a time"""
+    return [geovalidation.clean_coordinate_data(feature)[1] for feature in features]
+
+
+def best_time(func, repeat):
+    """Best wall-clock time of `repeat` runs, and the last result"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--features", type=int, nargs="+", default=[100_000, 300_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    for count in args.features:
+        with tempfile.TemporaryFile() as file:
+            write_points(file, count, args.seed)
+
+            def parse():
+                return list(geovalidation.iter_features(file))
+
+            parse_time, features = best_time(parse, args.repeat)
+            clean_time, errors = best_time(lambda: per_feature(features), args.repeat)
+            parse_clean, _ = best_time(
+                lambda: per_feature(geovalidation.iter_features(file)), args.repeat
+            )
+            pickle_all, _ = best_time(lambda: pickle_features(features), args.repeat)
+            pickle_geometry, _ = best_time(lambda: pickle_geometries(features), args.repeat)
+
+        print(f"{count} features ({sum(map(bool, errors))} issues):")
+        print(f"  parse only:                        {parse_time:6.2f} s")
+        print(f"  clean_coordinate_data loop:        {clean_time:6.2f} s")
+        print(f"  parse + clean_coordinate_data:     {parse_clean:6.2f} s")
+        print(f"  pickle features for a pool:        {pickle_all:6.2f} s")
+        print(f"  pickle geometries for a pool:      {pickle_geometry:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
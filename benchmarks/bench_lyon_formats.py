@@ -0,0 +1,108 @@
+"""Benchmark the output formats of lyon-transport-stops-script
+
+Processes synthetic stops around Lyon (or a real stops CSV with --csv) into
+CSV/WKT, GeoParquet and FlatGeobuf with process_data, then reports file size,
+write time and how long a downstream consumer takes to load the result with
+read_processed_stops: all columns, a single projected column, and a bounding
+box around the city centre.
+
+Usage (from the repository root):
+    python benchmarks/bench_lyon_formats.py --rows 100000 1000000
+    python benchmarks/bench_lyon_formats.py --csv arrets.csv
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SCRIPT = Path(__file__).resolve().parent.parent / "lyon-transport-stops-script.py"
+
+# Bounding box of the Lyon metropolitan area, and of its centre
+LON_RANGE = (4.65, 5.10)
+LAT_RANGE = (45.55, 45.95)
+CENTRE_BBOX = (4.80, 45.73, 4.88, 45.79)
+
+# (label, process_data options, output extension)
+VARIANTS = [
+    ("csv (wkt)", {"output_format": "csv"}, ".csv"),
+    ("geoparquet snappy", {"output_format": "geoparquet", "compression": "snappy"}, ".parquet"),
+    ("geoparquet zstd", {"output_format": "geoparquet", "compression": "zstd"}, ".parquet"),
+    ("flatgeobuf", {"output_format": "flatgeobuf", "spatial_index": False}, ".fgb"),
+    ("flatgeobuf indexed", {"output_format": "flatgeobuf", "spatial_index": True}, ".fgb"),
+]
+
+
+def load_script():
+    """Import the hyphenated script as a module"""
+    spec = importlib.util.spec_from_file_location("lyon_transport_stops", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_stops(rows, seed):
+    """Synthetic stops with the same lon/lat precision as the Lyon open data"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "nom": [f"Arret {i}" for i in range(rows)],
+        "desserte": rng.choice(["C3:A", "T1:R", "86:A", "C13:R"], rows),
+        "lon": rng.uniform(*LON_RANGE, rows).round(6),
+        "lat": rng.uniform(*LAT_RANGE, rows).round(6),
+    })
+
+
+def timed(func, *args, **kwargs):
+    """Wall-clock time of one call, and its result"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--csv", help="Benchmark a real stops CSV (lon/lat columns) instead")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    
+    # process_data reports through Streamlit, which only logs outside `streamlit run`
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    warnings.simplefilter("ignore")
+    script = load_script()
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.csv:
+            inputs = [(args.csv, args.csv)]
+        else:
+            inputs = []
+            for rows in args.rows:
+                path = os.path.join(workdir, f"stops_{rows}.csv")
+                make_stops(rows, args.seed).to_csv(path, index=False)
+                inputs.append((f"{rows} synthetic stops", path))
+        
+        for name, input_file in inputs:
+            print(f"{name}:")
+            print(f"  {'format':<20}{'size MB':>9}{'write s':>9}{'load s':>9}"
+                  f"{'1 col s':>9}{'bbox s':>9}")
+            for label, options, extension in VARIANTS:
+                output_file = os.path.join(workdir, f"out{extension}")
+                write_s, _ = timed(script.process_data, input_file, output_file, **options)
+                load_s, _ = timed(script.read_processed_stops, output_file)
+                column_s, _ = timed(script.read_processed_stops, output_file, columns=["id"])
+                bbox_s, _ = timed(script.read_processed_stops, output_file, bbox=CENTRE_BBOX)
+                size_mb = os.path.getsize(output_file) / 1e6
+                print(f"  {label:<20}{size_mb:>9.1f}{write_s:>9.2f}{load_s:>9.2f}"
+                      f"{column_s:>9.2f}{bbox_s:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
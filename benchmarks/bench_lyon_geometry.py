@@ -0,0 +1,107 @@
+"""Benchmark point construction and WKT/WKB output of lyon-transport-stops-script
+
+Compares the former per-row path ([Point(xy) for xy in zip(lon, lat)] then
+.astype(str)) with the vectorized create_geometry / serialize_geometry on
+synthetic stops around Lyon (or on a real stops CSV with --csv), checks that
+the WKT output is identical and reports rows/sec for each path.
+
+Usage (from the repository root):
+    python benchmarks/bench_lyon_geometry.py --rows 10000 100000 1000000
+    python benchmarks/bench_lyon_geometry.py --csv arrets.csv
+"""
+
+import argparse
+import importlib.util
+import time
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from shapely.geometry import Point
+
+SCRIPT = Path(__file__).resolve().parent.parent / "lyon-transport-stops-script.py"
+
+# Bounding box of the Lyon metropolitan area
+LON_RANGE = (4.65, 5.10)
+LAT_RANGE = (45.55, 45.95)
+
+
+def load_script():
+    """Import the hyphenated script as a module"""
+    spec = importlib.util.spec_from_file_location("lyon_transport_stops", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_stops(rows, seed):
+    """Synthetic stops with the same lon/lat precision as the Lyon open data"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "nom": [f"Arret {i}" for i in range(rows)],
+        "lon": rng.uniform(*LON_RANGE, rows).round(6),
+        "lat": rng.uniform(*LAT_RANGE, rows).round(6),
+    })
+
+
+def per_row(df):
+    """Former implementation: one Point per row, then astype(str)"""
+    geometry = [Point(xy) for xy in zip(df['lon'], df['lat'])]
+    gdf = gpd.GeoDataFrame(df, geometry=geometry, crs="EPSG:4326")
+    gdf['geometry'] = gdf['geometry'].astype(str)
+    return gdf
+
+
+def vectorized(script, geometry_format):
+    """Current implementation: create_geometry then serialize_geometry"""
+    def run(df):
+        gdf = gpd.GeoDataFrame(df, geometry=script.create_geometry(df), crs="EPSG:4326")
+        gdf['geometry'] = script.serialize_geometry(gdf['geometry'], geometry_format)
+        return gdf
+    return run
+
+
+def best_time(func, df, repeat):
+    """Best wall-clock time of `repeat` runs, and the last result"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df.copy())
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--csv", help="Benchmark a real stops CSV (lon/lat columns) instead")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    
+    script = load_script()
+    datasets = (
+        [(args.csv, pd.read_csv(args.csv, encoding="utf-8"))] if args.csv
+        else [(f"{rows} synthetic stops", make_stops(rows, args.seed)) for rows in args.rows]
+    )
+    
+    for name, df in datasets:
+        rows = len(df)
+        before, expected = best_time(per_row, df, args.repeat)
+        after_wkt, actual = best_time(vectorized(script, "wkt"), df, args.repeat)
+        after_wkb, _ = best_time(vectorized(script, "wkb"), df, args.repeat)
+        if not expected.equals(actual):
+            raise SystemExit(f"{name}: vectorized WKT output differs from the per-row output")
+        
+        print(f"{name}:")
+        print(f"  per-row Point + astype(str): {rows / before:>12,.0f} rows/s")
+        print(f"  points_from_xy + to_wkt:     {rows / after_wkt:>12,.0f} rows/s "
+              f"(x{before / after_wkt:.1f})")
+        print(f"  points_from_xy + to_wkb:     {rows / after_wkb:>12,.0f} rows/s "
+              f"(x{before / after_wkb:.1f})")
+
+
+if __name__ == "__main__":
+    main()
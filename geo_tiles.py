@@ -0,0 +1,652 @@
+"""
+Tuiles vectorielles (Mapbox Vector Tiles) pour l'aperçu des grandes couches
+Les tuiles sont produites à la demande depuis un index spatial en mémoire
+(STRtree en Web Mercator), servies par un petit serveur HTTP local ou
+précalculées dans un fichier MBTiles. Le coût d'une tuile dépend de ce
+qu'elle montre, pas de la taille de la couche : les entités plus petites
+qu'un pixel sont regroupées en une case par pixel.
+"""
+
+import gzip
+import json
+import math
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import shapely
+
+# Résolution des coordonnées dans une tuile et marge autour de la tuile
+# (en unités de tuile) pour que les traits ne soient pas coupés au bord
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+
+# Taille d'affichage d'une tuile en pixels (tolérance de simplification
+# et taille des cases de regroupement : un pixel)
+TILE_SIZE = 256
+
+# Nom de la couche dans les tuiles (à styler côté client)
+LAYER_NAME = "features"
+
+# Taille maximale des tuiles encodées gardées en mémoire par index
+TILE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Zoom maximum servi (au-delà, l'emprise d'une tuile n'est plus représentable
+# en flottants et les URL sont rejetées)
+TILE_MAX_ZOOM = 24
+
+# Estimation de la mémoire d'un index : coordonnées GEOS (x, y et z réservé)
+# et coût fixe d'une géométrie (objets GEOS et Python, STRtree, tableaux)
+INDEX_BYTES_PER_COORDINATE = 24
+INDEX_BYTES_PER_GEOMETRY = 400
+
+# Zooms exportés par défaut dans un fichier MBTiles
+MBTILES_MIN_ZOOM = 0
+MBTILES_MAX_ZOOM = 14
+
+# Serveur de tuiles : adresse d'écoute, nombre de couches enregistrées et
+# chemins acceptés (/<couche>/<z>/<x>/<y>.pbf, 2**24 tuiles par axe au plus)
+TILE_SERVER_HOST = "127.0.0.1"
+TILE_SERVER_LAYERS = 16
+TILE_PATH = re.compile(r"/(\w+)/(\d{1,2})/(\d{1,8})/(\d{1,8})\.pbf", re.ASCII)
+
+# Demi-largeur du monde en Web Mercator (EPSG:3857), en mètres
+MERCATOR_HALF_WIDTH = 20037508.342789244
+EARTH_RADIUS = 6378137.0
+
+# Commandes de géométrie MVT
+MOVE_TO, LINE_TO, CLOSE_PATH = 1, 2, 7
+
+# Types de géométrie MVT
+POINT, LINESTRING, POLYGON = 1, 2, 3
+
+
+def _varint(value):
+    """Encode un entier positif en varint protobuf"""
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _field(number, data):
+    """Champ protobuf de longueur variable (wire type 2)"""
+    return _varint(number << 3 | 2) + _varint(len(data)) + data
+
+
+def _varints(values):
+    """
+    Encode un tableau d'entiers positifs en varints, d'un seul bloc
+
+    Args:
+        values: Tableau d'entiers (inférieurs à 2**35)
+
+    Returns:
+        Tuple (octets, position de départ de chaque valeur + longueur totale)
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    sizes = np.ones(len(values), dtype=np.int64)
+    for shift in (7, 14, 21, 28):
+        sizes += values >= (1 << shift)
+    starts = np.concatenate([[0], np.cumsum(sizes)])
+    position = np.arange(starts[-1]) - np.repeat(starts[:-1], sizes)
+    data = (np.repeat(values, sizes) >> (7 * position).astype(np.uint64)) & 0x7F
+    data |= (position < np.repeat(sizes, sizes) - 1).astype(np.uint64) << 7
+    return data.astype(np.uint8).tobytes(), starts
+
+
+def _command(command, count):
+    return command | count << 3
+
+
+def _zigzag(values):
+    return (values << 1) ^ (values >> 63)
+
+
+def _first_indices(groups, count):
+    """Indice du premier élément de chaque groupe (groupes triés, -1 si vide)"""
+    first = np.full(count, -1, dtype=np.int64)
+    first[groups[::-1]] = np.arange(len(groups))[::-1]
+    return first
+
+
+def _feature_streams(coords, path_of, path_owner, closed):
+    """
+    Commandes MVT de chemins (lignes ou anneaux), regroupées par entité
+
+    Le curseur repart de (0, 0) au début de chaque entité et suit les
+    chemins d'une même entité, comme l'exige la spécification.
+
+    Args:
+        coords: Tableau (n, 2) d'entiers, chemins contigus et ordonnés
+        path_of: Chemin de chaque coordonnée (croissant)
+        path_owner: Entité de chaque chemin (croissant)
+        closed: True pour des anneaux (ClosePath, dernier point omis)
+
+    Returns:
+        Liste de tuples (entité, commandes encodées)
+    """
+    if not len(path_owner):
+        return []
+    counts = np.bincount(path_of, minlength=len(path_owner))
+    first_coord = np.cumsum(counts) - counts
+    feature_first = np.concatenate([[True], path_owner[1:] != path_owner[:-1]])
+
+    previous = np.roll(coords, 1, axis=0)
+    previous[first_coord[feature_first]] = 0
+    params = _zigzag(coords - previous)
+
+    # MoveTo, x, y, LineTo(n - 1), x, y, ... [, ClosePath]
+    lengths = 2 * counts + (3 if closed else 2)
+    path_start = np.cumsum(lengths) - lengths
+    position = np.arange(len(coords)) - first_coord[path_of]
+    index = path_start[path_of] + 2 * position + np.where(position == 0, 1, 2)
+    commands = np.empty(lengths.sum(), dtype=np.int64)
+    commands[index] = params[:, 0]
+    commands[index + 1] = params[:, 1]
+    commands[path_start] = _command(MOVE_TO, 1)
+    commands[path_start + 3] = LINE_TO | (counts - 1) << 3
+    if closed:
+        commands[path_start + lengths - 1] = _command(CLOSE_PATH, 1)
+
+    data, offsets = _varints(commands)
+    bounds = offsets[np.append(path_start[feature_first], len(commands))]
+    return [
+        (owner, data[start:end])
+        for owner, start, end in zip(path_owner[feature_first], bounds[:-1], bounds[1:])
+    ]
+
+
+def _encode_points(points, owner):
+    """Commandes MVT des points : un MoveTo(n) par entité"""
+    if not len(points):
+        return []
+    coords = shapely.get_coordinates(points).astype(np.int64)
+    feature_first = np.concatenate([[True], owner[1:] != owner[:-1]])
+    feature_of = np.cumsum(feature_first) - 1
+    counts = np.bincount(feature_of)
+
+    previous = np.roll(coords, 1, axis=0)
+    previous[feature_first] = 0
+    params = _zigzag(coords - previous)
+
+    lengths = 2 * counts + 1
+    feature_start = np.cumsum(lengths) - lengths
+    position = np.arange(len(coords)) - (np.cumsum(counts) - counts)[feature_of]
+    index = feature_start[feature_of] + 1 + 2 * position
+    commands = np.empty(lengths.sum(), dtype=np.int64)
+    commands[index] = params[:, 0]
+    commands[index + 1] = params[:, 1]
+    commands[feature_start] = MOVE_TO | counts << 3
+
+    data, offsets = _varints(commands)
+    bounds = offsets[np.append(feature_start, len(commands))]
+    return [
+        (feature, data[start:end])
+        for feature, start, end in zip(owner[feature_first], bounds[:-1], bounds[1:])
+    ]
+
+
+def _encode_lines(lines, owner):
+    """Commandes MVT des lignes (points répétés retirés, lignes dégénérées omises)"""
+    coords, line_of = shapely.get_coordinates(lines, return_index=True)
+    coords = coords.astype(np.int64)
+    repeated = np.zeros(len(coords), dtype=bool)
+    repeated[1:] = (line_of[1:] == line_of[:-1]) & np.all(coords[1:] == coords[:-1], axis=1)
+    coords, line_of = coords[~repeated], line_of[~repeated]
+
+    kept = np.bincount(line_of, minlength=len(lines)) >= 2
+    mask = kept[line_of]
+    renumber = np.cumsum(kept) - 1
+    return _feature_streams(coords[mask], renumber[line_of[mask]], owner[kept], closed=False)
+
+
+def _encode_polygons(polygons, owner):
+    """
+    Commandes MVT des polygones
+
+    Anneau extérieur d'aire positive, trous d'aire négative (axe y vers le
+    bas) ; les anneaux réduits à moins de trois points ou d'aire nulle après
+    l'arrondi sont omis, avec tout le polygone si c'est l'anneau extérieur.
+    """
+    rings, ring_polygon = shapely.get_rings(polygons, return_index=True)
+    coords, ring_of = shapely.get_coordinates(rings, return_index=True)
+    coords = coords.astype(np.int64)
+
+    # Point de fermeture et points répétés retirés
+    last = np.append(ring_of[1:] != ring_of[:-1], True)
+    coords, ring_of = coords[~last], ring_of[~last]
+    repeated = np.zeros(len(coords), dtype=bool)
+    repeated[1:] = (ring_of[1:] == ring_of[:-1]) & np.all(coords[1:] == coords[:-1], axis=1)
+    coords, ring_of = coords[~repeated], ring_of[~repeated]
+    first = _first_indices(ring_of, len(rings))
+    last = np.append(ring_of[1:] != ring_of[:-1], True)
+    closing = last & np.all(coords == coords[first[ring_of]], axis=1)
+    closing &= np.arange(len(coords)) != first[ring_of]
+    coords, ring_of = coords[~closing], ring_of[~closing]
+
+    # Aire signée (formule du géomètre) et sens de chaque anneau
+    first = _first_indices(ring_of, len(rings))
+    last = np.append(ring_of[1:] != ring_of[:-1], True)
+    following = np.where(last, first[ring_of], np.arange(len(coords)) + 1)
+    cross = coords[:, 0] * coords[following, 1] - coords[following, 0] * coords[:, 1]
+    area = np.bincount(ring_of, weights=cross, minlength=len(rings))
+    counts = np.bincount(ring_of, minlength=len(rings))
+    exterior = np.concatenate([[True], ring_polygon[1:] != ring_polygon[:-1]])[:len(rings)]
+
+    valid = (counts >= 3) & (area != 0)
+    polygon_valid = np.zeros(len(polygons), dtype=bool)
+    polygon_valid[ring_polygon[exterior]] = valid[exterior]
+    kept = valid & polygon_valid[ring_polygon]
+
+    position = np.arange(len(coords)) - first[ring_of]
+    reverse = ((area > 0) != exterior)[ring_of]
+    coords = coords[np.where(reverse, first[ring_of] + counts[ring_of] - 1 - position,
+                             np.arange(len(coords)))]
+
+    mask = kept[ring_of]
+    renumber = np.cumsum(kept) - 1
+    return _feature_streams(
+        coords[mask], renumber[ring_of[mask]], owner[ring_polygon[kept]], closed=True
+    )
+
+
+def encode_tile(geometries, ids, layer=LAYER_NAME):
+    """
+    Encode une tuile MVT à une couche, sans attributs
+
+    Les géométries sont décomposées en parties simples puis encodées par
+    type (points, lignes, polygones) sur des tableaux de coordonnées ; une
+    entité qui mélange plusieurs types devient une entité MVT par type.
+
+    Args:
+        geometries: Géométries en coordonnées entières de tuile
+        ids: Identifiants des entités (entiers positifs)
+        layer: Nom de la couche
+
+    Returns:
+        Tuile encodée (bytes vides si aucune entité n'est visible)
+    """
+    parts, owner = shapely.get_parts(np.asarray(geometries, dtype=object), return_index=True)
+    nonempty = ~shapely.is_empty(parts)
+    parts, owner = parts[nonempty], owner[nonempty]
+    types = shapely.get_type_id(parts)
+    while np.isin(types, (4, 5, 6, 7)).any():
+        parts, index = shapely.get_parts(parts, return_index=True)
+        owner, types = owner[index], shapely.get_type_id(parts)
+
+    encoded = []
+    for geometry_type, selected, encode in (
+        (POINT, types == 0, _encode_points),
+        (LINESTRING, (types == 1) | (types == 2), _encode_lines),
+        (POLYGON, types == 3, _encode_polygons),
+    ):
+        if selected.any():
+            encoded += [
+                (feature, geometry_type, data)
+                for feature, data in encode(parts[selected], owner[selected])
+            ]
+    if not encoded:
+        return b""
+
+    ids = np.asarray(ids)
+    features = b"".join(
+        _field(2,
+            b"\x08" + _varint(int(ids[feature]))
+            + b"\x18" + _varint(geometry_type)
+            + _field(4, data)
+        )
+        for feature, geometry_type, data in sorted(encoded, key=lambda item: item[:2])
+    )
+    layer_data = (
+        b"\x78" + _varint(2)
+        + _field(1, layer.encode("utf-8"))
+        + features
+        + b"\x28" + _varint(TILE_EXTENT)
+    )
+    return _field(3, layer_data)
+
+
+def tile_bounds(z, x, y):
+    """Emprise d'une tuile XYZ en Web Mercator (minx, miny, maxx, maxy)"""
+    span = 2 * MERCATOR_HALF_WIDTH / 2 ** z
+    minx = -MERCATOR_HALF_WIDTH + x * span
+    maxy = MERCATOR_HALF_WIDTH - y * span
+    return minx, maxy - span, minx + span, maxy
+
+
+def mercator_to_lonlat(x, y):
+    """Coordonnées Web Mercator vers (longitude, latitude) en degrés"""
+    return (
+        math.degrees(x / EARTH_RADIUS),
+        math.degrees(math.atan(math.sinh(y / EARTH_RADIUS))),
+    )
+
+
+class TileIndex:
+    """
+    Index spatial d'une couche, qui produit ses tuiles MVT à la demande
+
+    Les géométries sont projetées une fois en Web Mercator et indexées dans
+    un STRtree. Pour une tuile, seules les entités qui la touchent sont
+    lues : celles plus petites qu'un pixel deviennent une case d'un pixel
+    (un point pour les points), dédupliquée, les autres sont découpées à
+    l'emprise de la tuile, simplifiées à un pixel puis quantifiées.
+    Les tuiles encodées sont gardées dans un cache LRU.
+    """
+
+    def __init__(self, gdf, layer=LAYER_NAME, cache_bytes=TILE_CACHE_BYTES):
+        """
+        Args:
+            gdf: GeoDataFrame (sans CRS, les coordonnées sont supposées en WGS84)
+            layer: Nom de la couche dans les tuiles
+            cache_bytes: Taille maximale des tuiles encodées gardées en mémoire
+        """
+        geoseries = gdf.geometry if gdf.crs is not None else gdf.geometry.set_crs(4326)
+        geometries = np.asarray(geoseries.to_crs(3857).array, dtype=object)
+        extents = shapely.bounds(geometries)
+        valid = np.isfinite(extents).all(axis=1)
+
+        self.layer = layer
+        self.cache_bytes = cache_bytes
+        self.ids = np.flatnonzero(valid)
+        self.geometries = geometries[valid]
+        extents = extents[valid]
+        self.sizes = np.maximum(extents[:, 2] - extents[:, 0], extents[:, 3] - extents[:, 1])
+        self.centers = (extents[:, :2] + extents[:, 2:]) / 2
+        types = shapely.get_type_id(self.geometries)
+        self.is_point = np.isin(types, (0, 4))
+        self.is_polygonal = np.isin(types, (3, 6))
+        self.tree = shapely.STRtree(self.geometries)
+        self.mercator_bounds = (
+            tuple(extents[:, :2].min(axis=0)) + tuple(extents[:, 2:].max(axis=0))
+            if len(extents) else (np.nan,) * 4
+        )
+        self._coordinates = int(shapely.get_num_coordinates(self.geometries).sum())
+        self._tiles = OrderedDict()
+        self._tiles_size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.geometries)
+
+    @property
+    def nbytes(self):
+        """Estimation de la mémoire occupée, cache de tuiles plein compris"""
+        return (
+            self._coordinates * INDEX_BYTES_PER_COORDINATE
+            + len(self) * INDEX_BYTES_PER_GEOMETRY
+            + self.cache_bytes
+        )
+
+    @property
+    def bounds(self):
+        """Emprise de la couche en degrés (minx, miny, maxx, maxy)"""
+        minx, miny, maxx, maxy = self.mercator_bounds
+        return mercator_to_lonlat(minx, miny) + mercator_to_lonlat(maxx, maxy)
+
+    def tile(self, z, x, y):
+        """
+        Tuile MVT (non compressée), depuis le cache ou calculée
+
+        Args:
+            z, x, y: Coordonnées XYZ de la tuile (z au plus TILE_MAX_ZOOM)
+
+        Returns:
+            Tuile encodée (bytes vides si la tuile est vide)
+        """
+        if not (0 <= z <= TILE_MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+            raise ValueError(f"Tuile hors limites : {z}/{x}/{y}")
+        key = (z, x, y)
+        with self._lock:
+            if key in self._tiles:
+                self._tiles.move_to_end(key)
+                return self._tiles[key]
+        data = self._build_tile(z, x, y)
+        with self._lock:
+            if key not in self._tiles:
+                self._tiles[key] = data
+                self._tiles_size += len(data)
+            while self._tiles_size > self.cache_bytes:
+                self._tiles_size -= len(self._tiles.popitem(last=False)[1])
+        return data
+
+    def _build_tile(self, z, x, y):
+        minx, miny, maxx, maxy = tile_bounds(z, x, y)
+        scale = TILE_EXTENT / (maxx - minx)
+        pixel = (maxx - minx) / TILE_SIZE
+        margin = TILE_BUFFER / scale
+        clip = (minx - margin, miny - margin, maxx + margin, maxy + margin)
+
+        candidates = self.tree.query(shapely.box(*clip))
+        if not len(candidates):
+            return b""
+        candidates.sort()
+        small = self.sizes[candidates] < pixel
+
+        # Entités plus grandes qu'un pixel : découpe, simplification, quantification
+        large = np.flatnonzero(~small)
+        clipped = shapely.clip_by_rect(self.geometries[candidates[large]], *clip)
+        geometries = shapely.simplify(clipped, pixel, preserve_topology=False)
+        geometries = shapely.transform(geometries, lambda coords: np.rint(
+            (coords - (minx, maxy)) * (scale, -scale)
+        ))
+
+        # Polygones d'un ou deux pixels effondrés par la simplification : traités
+        # comme les petites entités plutôt que de disparaître
+        collapsed = ~shapely.is_empty(clipped) & (
+            shapely.is_empty(geometries)
+            | (self.is_polygonal[candidates[large]] & (shapely.area(geometries) < 1))
+        )
+        small[large[collapsed]] = True
+        visible = ~shapely.is_empty(geometries) & ~collapsed
+        geometries = list(geometries[visible])
+        ids = list(self.ids[candidates[large[visible]]])
+
+        # Entités plus petites qu'un pixel : une case (ou un point) par pixel
+        for is_point in (False, True):
+            selected = candidates[small & (self.is_point[candidates] == is_point)]
+            if not len(selected):
+                continue
+            cells, first = np.unique(
+                np.floor((self.centers[selected] - (minx, maxy)) / (pixel, -pixel)),
+                axis=0, return_index=True
+            )
+            inside = np.all((cells >= -1) & (cells <= TILE_SIZE), axis=1)
+            cells, first = cells[inside] * (TILE_EXTENT / TILE_SIZE), first[inside]
+            size = TILE_EXTENT / TILE_SIZE
+            if is_point:
+                cell_geometries = shapely.points(cells + size / 2)
+            else:
+                cell_geometries = shapely.box(
+                    cells[:, 0], cells[:, 1], cells[:, 0] + size, cells[:, 1] + size
+                )
+            geometries += list(cell_geometries)
+            ids += list(self.ids[selected[first]])
+
+        return encode_tile(geometries, ids, self.layer)
+
+    def tiles_for_zoom(self, z):
+        """
+        Tuiles XYZ qui couvrent l'emprise de la couche à un zoom donné
+
+        Args:
+            z: Niveau de zoom
+
+        Returns:
+            Générateur de tuples (x, y)
+        """
+        if not len(self):
+            return
+        minx, miny, maxx, maxy = self.mercator_bounds
+        count = 2 ** z
+        span = 2 * MERCATOR_HALF_WIDTH / count
+
+        def column(value):
+            return min(count - 1, max(0, int((value + MERCATOR_HALF_WIDTH) // span)))
+
+        def row(value):
+            return min(count - 1, max(0, int((MERCATOR_HALF_WIDTH - value) // span)))
+
+        for x in range(column(minx), column(maxx) + 1):
+            for y in range(row(maxy), row(miny) + 1):
+                yield x, y
+
+
+def export_mbtiles(index, path, min_zoom=MBTILES_MIN_ZOOM, max_zoom=MBTILES_MAX_ZOOM,
+                   name=None):
+    """
+    Précalcule les tuiles d'une couche dans un fichier MBTiles (SQLite)
+
+    Les tuiles vides ne sont pas écrites ; les autres sont compressées en
+    gzip et leur ligne suit le schéma TMS, comme l'exige la spécification.
+
+    Args:
+        index: TileIndex de la couche
+        path: Chemin du fichier MBTiles (remplacé s'il existe)
+        min_zoom: Premier zoom exporté
+        max_zoom: Dernier zoom exporté
+        name: Nom du jeu de tuiles (nom de la couche par défaut)
+
+    Returns:
+        Nombre de tuiles écrites
+    """
+    if not 0 <= min_zoom <= max_zoom <= TILE_MAX_ZOOM:
+        raise ValueError(f"Zooms hors limites : {min_zoom}-{max_zoom}")
+    minx, miny, maxx, maxy = index.bounds
+    metadata = {
+        "name": name or index.layer,
+        "format": "pbf",
+        "type": "overlay",
+        "minzoom": str(min_zoom),
+        "maxzoom": str(max_zoom),
+        "bounds": f"{minx},{miny},{maxx},{maxy}",
+        "center": f"{(minx + maxx) / 2},{(miny + maxy) / 2},{min_zoom}",
+        "json": json.dumps({"vector_layers": [
+            {"id": index.layer, "fields": {}, "minzoom": min_zoom, "maxzoom": max_zoom}
+        ]}),
+    }
+
+    count = 0
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            connection.executescript("""
+                DROP TABLE IF EXISTS metadata;
+                DROP TABLE IF EXISTS tiles;
+                CREATE TABLE metadata (name TEXT, value TEXT);
+                CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER,
+                                    tile_row INTEGER, tile_data BLOB);
+                CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row);
+            """)
+            connection.executemany("INSERT INTO metadata VALUES (?, ?)", metadata.items())
+            for z in range(min_zoom, max_zoom + 1):
+                rows = []
+                for x, y in index.tiles_for_zoom(z):
+                    data = index._build_tile(z, x, y)
+                    if data:
+                        rows.append((z, x, 2 ** z - 1 - y, gzip.compress(data)))
+                connection.executemany("INSERT INTO tiles VALUES (?, ?, ?, ?)", rows)
+                count += len(rows)
+    finally:
+        connection.close()
+    return count
+
+
+class TileServer:
+    """
+    Serveur HTTP local des tuiles : GET /<couche>/<z>/<x>/<y>.pbf
+
+    Tourne dans un thread démon. Les couches sont enregistrées sous une clé
+    et seules les TILE_SERVER_LAYERS plus récentes sont gardées. Le
+    navigateur doit pouvoir joindre host:port (même machine par défaut) ;
+    sinon, exporter les tuiles avec export_mbtiles.
+    """
+
+    def __init__(self, host=TILE_SERVER_HOST, port=0, max_layers=TILE_SERVER_LAYERS):
+        """
+        Args:
+            host: Adresse d'écoute
+            port: Port d'écoute (0 = choisi par le système)
+            max_layers: Nombre de couches gardées
+        """
+        self.max_layers = max_layers
+        self._layers = OrderedDict()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = None
+
+    def _handler(self):
+        server = self
+
+        class TileHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                try:
+                    data = server._tile(self.path)
+                except Exception:
+                    self.send_error(500)
+                    return
+                if data is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-protobuf")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return TileHandler
+
+    def _tile(self, path):
+        """Tuile demandée par un chemin /<couche>/<z>/<x>/<y>.pbf (None si inconnue)"""
+        match = TILE_PATH.fullmatch(path.split("?")[0])
+        if match is None:
+            return None
+        key = match.group(1)
+        z, x, y = (int(value) for value in match.group(2, 3, 4))
+        with self._lock:
+            index = self._layers.get(key)
+        if index is None or z > TILE_MAX_ZOOM or x >= 2 ** z or y >= 2 ** z:
+            return None
+        return index.tile(z, x, y)
+
+    def start(self):
+        """Démarre le serveur (une seule fois) et le retourne"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Arrête le serveur"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def register(self, key, index):
+        """
+        Enregistre (ou remplace) une couche
+
+        Args:
+            key: Clé de la couche dans l'URL (lettres et chiffres)
+            index: TileIndex de la couche
+
+        Returns:
+            Modèle d'URL des tuiles, avec {z}, {x} et {y}
+        """
+        with self._lock:
+            self._layers[key] = index
+            self._layers.move_to_end(key)
+            while len(self._layers) > self.max_layers:
+                self._layers.popitem(last=False)
+        return f"http://{self.host}:{self.port}/{key}/{{z}}/{{x}}/{{y}}.pbf"
@@ -0,0 +1,364 @@
+"""
+Moteur d'union géométrique parallèle
+Partitionne les géométries spatialement (ordre de Morton), fusionne chaque
+partition dans un pool de processus puis combine les résultats partiels
+par réduction en arbre. L'ordre des unions change, donc l'arrondi
+flottant des intersections aussi : le résultat a les mêmes parties et les
+mêmes sommets que union_all, à UNION_TOLERANCE près (voir same_union).
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+# Nombre de géométries fusionnées par tâche lors de la première étape
+DEFAULT_PARTITION_SIZE = 2000
+
+# Colonne du nombre d'entités fusionnées dans chaque groupe (dissolve_by)
+COUNT_COLUMN = "nombre_entites"
+
+# Agrégations d'attributs proposées par dissolve_by
+AGGREGATIONS = ("first", "sum", "count")
+
+# Résolution de la grille utilisée pour l'ordre de Morton (2**16 cases par axe)
+MORTON_BITS = 16
+
+# Écart maximal de coordonnées entre une union parallèle et union_all, dans
+# l'unité du CRS (les écarts mesurés sont de l'ordre de 1e-14)
+UNION_TOLERANCE = 1e-9
+
+
+def default_workers():
+    """Nombre de processus utilisés par défaut (un par cœur)"""
+    return os.cpu_count() or 1
+
+
+def _effective_workers(workers, tasks):
+    """
+    Nombre de processus réellement utiles
+
+    Args:
+        workers: Nombre de processus demandé (None = un par cœur)
+        tasks: Nombre de tâches de la première étape
+
+    Returns:
+        Nombre de processus, plafonné au nombre de cœurs et de tâches
+    """
+    return max(1, min(workers or default_workers(), default_workers(), tasks))
+
+
+def same_union(result, expected, tolerance=UNION_TOLERANCE):
+    """
+    Vérifie qu'une union parallèle correspond à l'union en série
+
+    Les deux géométries sont normalisées (ordre des parties et des anneaux)
+    puis comparées sommet par sommet avec equals_exact.
+
+    Args:
+        result: Géométrie produite par parallel_union ou dissolve_by
+        expected: Géométrie de référence (union_all)
+        tolerance: Écart maximal par coordonnée
+
+    Returns:
+        True si les deux unions ont les mêmes parties et les mêmes sommets
+    """
+    return bool(shapely.equals_exact(
+        shapely.normalize(result), shapely.normalize(expected), tolerance
+    ))
+
+
+def _spread_bits(values):
+    """Intercale un bit nul entre chaque bit des entiers 16 bits"""
+    values = values.astype(np.uint32)
+    values = (values | (values << 8)) & 0x00FF00FF
+    values = (values | (values << 4)) & 0x0F0F0F0F
+    values = (values | (values << 2)) & 0x33333333
+    values = (values | (values << 1)) & 0x55555555
+    return values
+
+
+def morton_order(geometries):
+    """
+    Ordonne les géométries selon la courbe de Morton (Z-order) de leur centre
+
+    Deux géométries proches dans cet ordre sont proches dans l'espace : des
+    tranches contiguës forment des tuiles compactes.
+
+    Args:
+        geometries: Tableau numpy de géométries shapely
+
+    Returns:
+        Indices des géométries triées
+    """
+    bounds = shapely.bounds(geometries)
+    centers_x = (bounds[:, 0] + bounds[:, 2]) / 2
+    centers_y = (bounds[:, 1] + bounds[:, 3]) / 2
+
+    cells = (1 << MORTON_BITS) - 1
+    codes = []
+    for centers in (centers_x, centers_y):
+        finite = np.isfinite(centers)
+        low, high = (centers[finite].min(), centers[finite].max()) if finite.any() else (0, 0)
+        scaled = np.zeros(len(centers))
+        if high > low:
+            scaled[finite] = (centers[finite] - low) / (high - low) * cells
+        codes.append(_spread_bits(scaled))
+
+    return np.argsort(codes[0] | (codes[1] << 1), kind="stable")
+
+
+def partition_geometries(geometries, partition_size=DEFAULT_PARTITION_SIZE):
+    """
+    Découpe les géométries en partitions spatialement compactes
+
+    Args:
+        geometries: Tableau numpy de géométries shapely
+        partition_size: Nombre maximum de géométries par partition
+
+    Returns:
+        Liste de tableaux de géométries
+    """
+    ordered = geometries[morton_order(geometries)]
+    return [
+        ordered[start:start + partition_size]
+        for start in range(0, len(ordered), partition_size)
+    ]
+
+
+def _union(geometries):
+    """Union d'un groupe de géométries (exécutée dans un processus du pool)"""
+    return shapely.union_all(np.asarray(geometries, dtype=object))
+
+
+def parallel_union(geometries, workers=None, partition_size=DEFAULT_PARTITION_SIZE):
+    """
+    Fusionne des géométries sur plusieurs cœurs
+
+    Étapes : partitionnement spatial, union de chaque partition dans un
+    ProcessPoolExecutor, puis réduction en arbre des unions partielles
+    (deux par deux, en conservant l'ordre de Morton pour ne fusionner
+    que des voisines), chaque paire partant dès que ses deux unions sont
+    prêtes (voir _union_in_pool). Avec un seul processus utile (un cœur, un
+    processus demandé ou une seule partition), union_all en série.
+
+    Le résultat correspond à union_all à UNION_TOLERANCE près (same_union),
+    pas exactement : l'ordre des unions change l'arrondi des intersections.
+
+    Args:
+        geometries: Séquence de géométries shapely (GeoSeries acceptée)
+        workers: Nombre de processus (None = un par cœur, 1 = sans pool)
+        partition_size: Nombre maximum de géométries par partition
+
+    Returns:
+        Tuple (géométrie fusionnée, durées des étapes en secondes)
+    """
+    timings = {}
+
+    geometries = np.asarray(geometries, dtype=object)
+    geometries = geometries[~shapely.is_missing(geometries)]
+    workers = _effective_workers(workers, -(-len(geometries) // partition_size))
+
+    if workers <= 1:
+        start = time.perf_counter()
+        result = _union(geometries)
+        timings["union"] = time.perf_counter() - start
+        return result, timings
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        [result] = _union_in_pool(pool, [geometries], partition_size)
+    timings["union"] = time.perf_counter() - start
+
+    return result, timings
+
+
+class _TreeReduction:
+    """
+    Réduction en arbre d'un groupe, alimentée au fil des unions terminées
+
+    Les feuilles sont les unions partielles, dans l'ordre de Morton. Deux
+    nœuds frères sont fusionnés dès qu'ils sont prêts tous les deux, sans
+    attendre le reste de leur niveau.
+    """
+
+    def __init__(self, leaves):
+        """
+        Args:
+            leaves: Nombre d'unions partielles à combiner
+        """
+        self.sizes = [leaves]
+        while self.sizes[-1] > 1:
+            self.sizes.append((self.sizes[-1] + 1) // 2)
+        self.result = None
+        self._waiting = {}
+
+    def add(self, level, position, geometry):
+        """
+        Enregistre un nœud terminé
+
+        Args:
+            level: Niveau du nœud (0 = union partielle)
+            position: Position du nœud dans son niveau
+            geometry: Union du nœud
+
+        Returns:
+            Unions à lancer : liste de tuples (niveau, position, paire de géométries)
+        """
+        while level + 1 < len(self.sizes):
+            sibling = position ^ 1
+            if sibling >= self.sizes[level]:
+                # Dernier nœud d'un niveau impair : il remonte tel quel
+                level, position = level + 1, position // 2
+                continue
+            other = self._waiting.pop((level, sibling), None)
+            if other is None:
+                self._waiting[(level, position)] = geometry
+                return []
+            pair = [other, geometry] if sibling < position else [geometry, other]
+            return [(level + 1, position // 2, pair)]
+        self.result = geometry
+        return []
+
+
+def _union_groups(groups):
+    """Union de chaque groupe d'un lot (exécutée dans un processus du pool)"""
+    return [_union(group) for group in groups]
+
+
+def _batch_groups(indices, groups, partition_size):
+    """
+    Regroupe les petits groupes en lots d'environ partition_size géométries
+
+    Args:
+        indices: Indices des groupes à regrouper
+        groups: Liste de tableaux de géométries
+        partition_size: Nombre cible de géométries par lot
+
+    Returns:
+        Liste de lots (listes d'indices), dans l'ordre des groupes
+    """
+    batches, batch, size = [], [], 0
+    for i in indices:
+        batch.append(i)
+        size += len(groups[i])
+        if size >= partition_size:
+            batches.append(batch)
+            batch, size = [], 0
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _union_in_pool(pool, groups, partition_size):
+    """
+    Union de chaque groupe dans un pool de processus
+
+    Toutes les tâches sont soumises d'emblée : partitions des groupes plus
+    grands que partition_size (les plus longues, en premier) puis lots de
+    petits groupes. Chaque grand groupe est réduit en arbre au fil des
+    partitions terminées, si bien que le pool n'attend jamais la fin d'un
+    groupe ou d'un niveau pour continuer.
+
+    Args:
+        pool: ProcessPoolExecutor
+        groups: Liste de tableaux de géométries
+        partition_size: Taille des lots et seuil des grands groupes
+
+    Returns:
+        Unions, dans l'ordre des groupes
+    """
+    unions = [None] * len(groups)
+    reductions = {}
+    futures = {}
+
+    for i, group in enumerate(groups):
+        if len(group) > partition_size:
+            partitions = partition_geometries(group, partition_size)
+            reductions[i] = _TreeReduction(len(partitions))
+            for position, partition in enumerate(partitions):
+                futures[pool.submit(_union, partition)] = (i, 0, position)
+
+    small = [i for i, group in enumerate(groups) if len(group) <= partition_size]
+    for batch in _batch_groups(small, groups, partition_size):
+        futures[pool.submit(_union_groups, [groups[i] for i in batch])] = (batch, None, None)
+
+    while futures:
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            key, level, position = futures.pop(future)
+            if level is None:
+                for i, union in zip(key, future.result()):
+                    unions[i] = union
+                continue
+
+            reduction = reductions[key]
+            for next_level, next_position, pair in reduction.add(level, position, future.result()):
+                futures[pool.submit(_union, pair)] = (key, next_level, next_position)
+            if reduction.result is not None:
+                unions[key] = reduction.result
+
+    return unions
+
+
+def dissolve_by(gdf, by, aggregations=None, workers=None,
+                partition_size=DEFAULT_PARTITION_SIZE):
+    """
+    Fusionne les géométries par valeur d'attribut (équivalent de GeoDataFrame.dissolve)
+
+    Les lignes sont groupées par hachage (groupby().ngroup()), les petits
+    groupes sont fusionnés par lots dans un pool de processus et les groupes
+    plus grands que partition_size passent par le moteur partition +
+    réduction en arbre de parallel_union, toutes les tâches partageant le
+    même pool (voir _union_in_pool). Les petits groupes donnent exactement
+    le résultat de GeoDataFrame.dissolve, les grands groupes le même à
+    UNION_TOLERANCE près (same_union).
+
+    Args:
+        gdf: GeoDataFrame à fusionner
+        by: Colonne (ou liste de colonnes) de regroupement
+        aggregations: Dictionnaire {colonne: 'count' | 'sum' | 'first'}
+        workers: Nombre de processus (None = un par cœur, 1 = sans pool)
+        partition_size: Taille des lots et seuil des grands groupes
+
+    Returns:
+        Tuple (GeoDataFrame avec une ligne par groupe, durées des étapes en secondes)
+    """
+    aggregations = dict(aggregations or {})
+    by = [by] if isinstance(by, str) else list(by)
+    timings = {}
+
+    # Regroupement par hachage, groupes numérotés par ordre d'apparition
+    start = time.perf_counter()
+    grouped = gdf.drop(columns=gdf.geometry.name).groupby(by, sort=False, dropna=False)
+    codes = grouped.ngroup().to_numpy()
+    order = np.argsort(codes, kind="stable")
+    boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+    geometries = np.asarray(gdf.geometry.array, dtype=object)[order]
+    groups = np.split(geometries, boundaries) if len(geometries) else []
+    timings["regroupement"] = time.perf_counter() - start
+
+    # Union par groupe
+    start = time.perf_counter()
+    workers = _effective_workers(workers, -(-len(geometries) // partition_size))
+    if workers <= 1:
+        unions = [_union(group) for group in groups]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            unions = _union_in_pool(pool, groups, partition_size)
+    timings["union"] = time.perf_counter() - start
+
+    # Attributs agrégés
+    start = time.perf_counter()
+    attributes = grouped.size().rename(COUNT_COLUMN).to_frame()
+    if aggregations:
+        attributes = attributes.join(grouped.agg(aggregations))
+    result = gpd.GeoDataFrame(
+        attributes.reset_index(), geometry=unions, crs=gdf.crs
+    )
+    timings["agrégation"] = time.perf_counter() - start
+
+    return result, timings
@@ -1,10 +1,29 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import geopandas as gpd
 import pandas as pd
-from shapely.ops import unary_union
+import hashlib
+import io
 import json
+import math
+import os
+import tempfile
+import threading
+import uuid
+import numpy as np
+import shapely
+from collections import OrderedDict, namedtuple
 import folium
+from folium.plugins import VectorGridProtobuf
 from streamlit_folium import folium_static
+from geo_union import (
+    AGGREGATIONS,
+    DEFAULT_PARTITION_SIZE,
+    default_workers,
+    dissolve_by,
+    parallel_union,
+)
+from geo_tiles import LAYER_NAME, TileIndex, TileServer, export_mbtiles
 
 # Configuration de la page
 st.set_page_config(page_title="GeoJSON Combiner", layout="wide")
@@ -19,16 +38,241 @@ st.markdown("""
 - Combinez plusieurs caractéristiques géométriques en une seule forme
 """)
 
+# Budget mémoire du cache des fichiers analysés, partagé par toutes les sessions
+PARSED_FILES_BUDGET = 512 * 1024 * 1024
+
+# Taille des cartes d'aperçu en pixels (hauteur de folium_static par défaut)
+PREVIEW_WIDTH = 400
+PREVIEW_HEIGHT = 500
+
+# Niveau de détail des aperçus : tolérance de simplification en pixels au
+# zoom qui cadre les données, zoom maximum et taille maximale du GeoJSON
+PREVIEW_PIXEL_TOLERANCE = 1.0
+PREVIEW_MAX_ZOOM = 18
+PREVIEW_MAX_BYTES = 2 * 1024 * 1024
+PREVIEW_MAX_ATTEMPTS = 6
+
+# Au-delà de ce nombre d'entités, les aperçus passent par des tuiles
+# vectorielles servies localement au lieu d'un GeoJSON complet
+VECTOR_TILE_THRESHOLD = 100_000
+
+# Largeur du monde au zoom 0 (tuile de 256 pixels), en degrés et en mètres
+WORLD_WIDTH_DEGREES = 360.0
+WORLD_WIDTH_METERS = 40075016.686
+
+# Fichier analysé : données, emprise, centre de la carte, aperçu HTML et
+# index des tuiles vectorielles (None pour les petites couches)
+ParsedFile = namedtuple("ParsedFile", ["gdf", "bounds", "center", "preview_html", "tiles"])
+
+class ParsedFileCache:
+    """
+    Cache LRU des fichiers GeoJSON analysés, indexé par l'empreinte du contenu
+    
+    La taille estimée des entrées (fichier brut, colonnes, aperçu HTML) est
+    bornée par max_bytes : les entrées les moins récemment utilisées sont
+    évincées au-delà.
+    """
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+    
+    def put(self, key, value, nbytes):
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self.size += nbytes
+            # Toujours garder l'entrée qui vient d'être ajoutée
+            while self.size > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+@st.cache_resource
+def get_parsed_files():
+    """Cache des fichiers analysés, unique pour le processus"""
+    return ParsedFileCache(PARSED_FILES_BUDGET)
+
+@st.cache_resource
+def get_tile_server():
+    """Serveur local des tuiles vectorielles, unique pour le processus"""
+    return TileServer().start()
+
+def mbtiles_bytes(tiles):
+    """Précalcule les tuiles d'une couche dans un fichier MBTiles et retourne son contenu"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tiles.mbtiles")
+        export_mbtiles(tiles, path)
+        with open(path, "rb") as f:
+            return f.read()
+
+def map_center(gdf):
+    """Centre de la carte : moyenne des centroïdes (latitude, longitude)"""
+    centroids = gdf.geometry.centroid
+    return [centroids.y.mean(), centroids.x.mean()]
+
+def load_geojson(uploaded_file):
+    """
+    Analyse un fichier déposé, ou le reprend du cache si son contenu est connu
+    
+    Args:
+        uploaded_file: Fichier déposé dans st.file_uploader
+    
+    Returns:
+        ParsedFile (le GeoDataFrame est partagé : ne pas le modifier)
+    """
+    data = uploaded_file.getvalue()
+    key = hashlib.blake2b(data, digest_size=16).hexdigest()
+    cache = get_parsed_files()
+    parsed = cache.get(key)
+    if parsed is None:
+        gdf = gpd.read_file(io.BytesIO(data))
+        bounds = tuple(gdf.total_bounds)
+        center = map_center(gdf)
+        tiles = TileIndex(gdf) if len(gdf) >= VECTOR_TILE_THRESHOLD else None
+        figure = folium.Figure().add_child(display_map(gdf, center, bounds, tiles, key))
+        parsed = ParsedFile(gdf, bounds, center, figure.render(), tiles)
+        nbytes = (
+            len(data)
+            + int(gdf.memory_usage(deep=True).sum())
+            + len(parsed.preview_html)
+            + (tiles.nbytes if tiles is not None else 0)
+        )
+        cache.put(key, parsed, nbytes)
+    elif parsed.tiles is not None:
+        # L'aperçu en cache pointe vers cette couche : la réenregistrer au cas
+        # où le serveur l'aurait oubliée
+        get_tile_server().register(key, parsed.tiles)
+    return parsed
+
+def preview_tolerance(gdf, bounds):
+    """
+    Tolérance de simplification équivalente à PREVIEW_PIXEL_TOLERANCE pixels
+    
+    Le zoom est celui qui fait tenir l'emprise dans la carte d'aperçu ; la
+    tolérance est exprimée dans l'unité du CRS (degrés ou mètres).
+    
+    Args:
+        gdf: GeoDataFrame affiché
+        bounds: Emprise (minx, miny, maxx, maxy)
+    
+    Returns:
+        Tolérance dans l'unité des coordonnées
+    """
+    geographic = gdf.crs is None or gdf.crs.is_geographic
+    world = WORLD_WIDTH_DEGREES if geographic else WORLD_WIDTH_METERS
+    minx, miny, maxx, maxy = bounds
+    zooms = [
+        math.log2(pixels * world / (256 * span))
+        for span, pixels in ((maxx - minx, PREVIEW_WIDTH), (maxy - miny, PREVIEW_HEIGHT))
+        if span > 0
+    ]
+    zoom = max(0.0, min(zooms + [PREVIEW_MAX_ZOOM]))
+    return world / (256 * 2 ** zoom) * PREVIEW_PIXEL_TOLERANCE
+
+def preview_geojson(gdf, bounds):
+    """
+    GeoJSON allégé pour l'aperçu : géométries seules, simplifiées et quantifiées
+    
+    La simplification préserve la topologie et les coordonnées sont arrondies
+    à une grille plus fine que la tolérance. Les géométries sont regroupées
+    dans une seule entité (le style est uniforme), ce qui évite le coût fixe
+    de chaque entité. Tant que le résultat dépasse PREVIEW_MAX_BYTES, la
+    tolérance est doublée : les géométries déjà simplifiées le sont à nouveau
+    (écart total inférieur à deux fois la tolérance finale) et les entités
+    plus petites que la tolérance sont remplacées par la case de la grille
+    (de côté la tolérance) qui contient leur centre, chaque case n'étant
+    dessinée qu'une fois. Les données complètes restent utilisées pour la
+    fusion et le téléchargement.
+    
+    Args:
+        gdf: GeoDataFrame à afficher
+        bounds: Emprise (minx, miny, maxx, maxy)
+    
+    Returns:
+        Tuple (GeoJSON en texte, tolérance utilisée)
+    """
+    geometries = np.asarray(gdf.geometry.array, dtype=object)
+    geometries = geometries[~(shapely.is_missing(geometries) | shapely.is_empty(geometries))]
+    extents = shapely.bounds(geometries)
+    sizes = np.maximum(extents[:, 2] - extents[:, 0], extents[:, 3] - extents[:, 1])
+    centers = (extents[:, :2] + extents[:, 2:]) / 2
+    tolerance = preview_tolerance(gdf, bounds)
+    kept = np.ones(len(geometries), dtype=bool)
+    
+    for attempt in range(PREVIEW_MAX_ATTEMPTS):
+        if attempt:
+            tolerance *= 2
+            kept &= sizes >= tolerance
+        
+        geometries[kept] = shapely.simplify(geometries[kept], tolerance, preserve_topology=True)
+        cells = np.unique(np.floor(centers[~kept] / tolerance), axis=0) * tolerance
+        visible = np.concatenate([
+            geometries[kept],
+            shapely.box(cells[:, 0], cells[:, 1],
+                        cells[:, 0] + tolerance, cells[:, 1] + tolerance),
+        ])
+        
+        # Chaque coordonnée occupe au moins « [x,y], » avec decimals chiffres
+        # après la virgule : inutile de sérialiser si le plafond est déjà dépassé
+        decimals = max(0, math.ceil(-math.log10(tolerance)))
+        coordinates = shapely.get_num_coordinates(visible).sum()
+        if coordinates * (2 * decimals + 8) > PREVIEW_MAX_BYTES and attempt + 1 < PREVIEW_MAX_ATTEMPTS:
+            continue
+        quantized = shapely.transform(visible, lambda coords: np.round(coords, decimals))
+        payload = (
+            '{"type": "Feature", "properties": {}, "geometry": '
+            + shapely.to_geojson(shapely.geometrycollections(quantized))
+            + '}'
+        )
+        if len(payload) <= PREVIEW_MAX_BYTES:
+            break
+    return payload, tolerance
+
 # Fonction pour afficher la carte
-def display_map(gdf):
-    # Créer une carte centrée sur les données
-    m = folium.Map(location=[gdf.geometry.centroid.y.mean(), 
-                           gdf.geometry.centroid.x.mean()],
+def display_map(gdf, center=None, bounds=None, tiles=None, tiles_key=None):
+    # Créer une carte centrée sur les données (centre précalculé si fourni)
+    m = folium.Map(location=center or map_center(gdf),
                   zoom_start=11)
     
-    # Ajouter les données GeoJSON à la carte
+    # Cadrer sur l'emprise (minx, miny, maxx, maxy)
+    if bounds is None:
+        bounds = tuple(gdf.total_bounds)
+    if not all(pd.notna(value) for value in bounds):
+        return m
+    minx, miny, maxx, maxy = bounds
+    m.fit_bounds([[miny, minx], [maxy, maxx]])
+    
+    # Grandes couches : tuiles vectorielles produites à la demande pour la vue
+    # courante (index fourni, ou construit ici sous une clé éphémère)
+    if tiles is not None or len(gdf) >= VECTOR_TILE_THRESHOLD:
+        url = get_tile_server().register(
+            tiles_key or uuid.uuid4().hex, tiles if tiles is not None else TileIndex(gdf)
+        )
+        VectorGridProtobuf(url, "Aperçu", {
+            "vectorTileLayerStyles": {LAYER_NAME: {'fill': True,
+                                                   'fillColor': 'blue',
+                                                   'color': 'blue',
+                                                   'weight': 1,
+                                                   'fillOpacity': 0.1,
+                                                   'radius': 2}}
+        }).add_to(m)
+        return m
+    
+    # Ajouter les données GeoJSON à la carte (version allégée pour l'affichage)
+    payload, _ = preview_geojson(gdf, bounds)
     folium.GeoJson(
-        gdf.__geo_interface__,
+        payload,
         style_function=lambda x: {'fillColor': 'blue',
                                 'color': 'blue',
                                 'weight': 1,
@@ -54,30 +298,95 @@ if uploaded_files:
         
         for uploaded_file in uploaded_files:
             try:
-                gdf = gpd.read_file(uploaded_file)
-                gdfs.append(gdf)
+                # Analyse mise en cache par contenu : un rerun ne relit pas le fichier
+                parsed = load_geojson(uploaded_file)
+                gdfs.append(parsed.gdf)
                 st.success(f"✅ {uploaded_file.name} chargé avec succès!")
                 
-                # Afficher la carte des données originales
+                # Afficher la carte des données originales (HTML mis en cache)
                 st.write(f"Aperçu de {uploaded_file.name}:")
-                m = display_map(gdf)
-                folium_static(m, width=400)
+                components.html(parsed.preview_html, height=PREVIEW_HEIGHT + 10, width=400)
+                
+                # Tuiles précalculées, pour un aperçu hors de cette machine
+                if parsed.tiles is not None:
+                    st.download_button(
+                        label="📥 Télécharger les tuiles (MBTiles)",
+                        data=lambda tiles=parsed.tiles: mbtiles_bytes(tiles),
+                        file_name=f"{os.path.splitext(uploaded_file.name)[0]}.mbtiles",
+                        mime="application/vnd.sqlite3",
+                        key=f"mbtiles-{uploaded_file.name}"
+                    )
                 
             except Exception as e:
                 st.error(f"❌ Erreur lors du chargement de {uploaded_file.name}: {str(e)}")
     
     with col2:
         st.subheader("Résultat de la combinaison")
+        
+        # Mode de fusion : tout en une géométrie, ou une géométrie par valeur d'attribut
+        attribute_columns = list(dict.fromkeys(
+            column for gdf in gdfs for column in gdf.columns if column != gdf.geometry.name
+        ))
+        mode = st.radio(
+            "Mode de fusion",
+            ["Tout fusionner", "Fusionner par attribut"],
+            horizontal=True,
+            disabled=not attribute_columns
+        )
+        group_columns = []
+        if mode == "Fusionner par attribut":
+            group_columns = st.multiselect(
+                "Regrouper par", attribute_columns,
+                help="Une géométrie par valeur (par exemple par commune ou par ligne)"
+            )
+            numeric_aggregation = st.selectbox(
+                "Agrégation des colonnes numériques", AGGREGATIONS, index=1,
+                help="Les autres colonnes gardent leur première valeur"
+            )
+        
+        # Paramètres du moteur d'union parallèle
+        with st.expander("⚙️ Paramètres de fusion"):
+            workers = st.number_input(
+                "Processus", min_value=1, value=default_workers(),
+                help="Nombre de cœurs utilisés pour fusionner les partitions"
+            )
+            partition_size = st.number_input(
+                "Géométries par partition", min_value=1, value=DEFAULT_PARTITION_SIZE,
+                step=500, help="Taille des tuiles spatiales fusionnées par chaque processus"
+            )
+        
         if gdfs and st.button("Combiner les caractéristiques"):
             try:
                 # Combiner tous les GeoDataFrames
                 combined_gdf = gpd.GeoDataFrame(pd.concat(gdfs, ignore_index=True))
                 
-                # Fusionner les géométries
-                combined_geometry = unary_union(combined_gdf.geometry)
+                if group_columns:
+                    # Fusionner par groupe, avec les attributs agrégés
+                    aggregations = {
+                        column: (
+                            numeric_aggregation
+                            if pd.api.types.is_numeric_dtype(combined_gdf[column])
+                            else "first"
+                        )
+                        for column in attribute_columns if column not in group_columns
+                    }
+                    result_gdf, timings = dissolve_by(
+                        combined_gdf, group_columns, aggregations,
+                        int(workers), int(partition_size)
+                    )
+                else:
+                    # Fusionner les géométries (partitions spatiales en parallèle,
+                    # puis réduction en arbre)
+                    combined_geometry, timings = parallel_union(
+                        combined_gdf.geometry, int(workers), int(partition_size)
+                    )
+                    
+                    # Créer un nouveau GeoDataFrame avec la géométrie combinée
+                    result_gdf = gpd.GeoDataFrame(geometry=[combined_geometry])
                 
-                # Créer un nouveau GeoDataFrame avec la géométrie combinée
-                result_gdf = gpd.GeoDataFrame(geometry=[combined_geometry])
+                st.caption(" · ".join(
+                    f"{stage} : {seconds:.2f} s" for stage, seconds in timings.items()
+                ))
                 
                 # Afficher la carte du résultat
                 m_result = display_map(result_gdf)
@@ -101,7 +410,7 @@ if uploaded_files:
 with st.expander("ℹ️ Guide d'utilisation"):
     st.markdown("""
     1. Téléchargez un ou plusieurs fichiers GeoJSON
-    2. Visualisez les données sur la carte
-    3. Cliquez sur 'Combiner les caractéristiques' pour fusionner
+    2. Visualisez les données sur la carte (les grandes couches sont affichées en tuiles vectorielles, téléchargeables en MBTiles)
+    3. Choisissez le mode de fusion (tout, ou par attribut) puis cliquez sur 'Combiner les caractéristiques'
     4. Téléchargez le résultat
     """)
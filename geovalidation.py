@@ -0,0 +1,336 @@
+"""Streaming GeoJSON validation engine shared by the Streamlit app and the CLI
+
+Kept free of Streamlit so the CLI runs without it.
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import random
+import sys
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+import ijson  # For handling large JSON files
+
+# Per-feature issue messages
+NOT_A_POINT = "Not a point geometry"
+INVALID_ARITY = "Invalid coordinate array length"
+OUT_OF_RANGE = "Coordinates out of valid range"
+# Category for the "Error cleaning coordinates: ..." messages
+CLEANING_ERROR = "Error cleaning coordinates"
+
+# Example feature indices kept per issue category
+DEFAULT_ISSUE_SAMPLE_SIZE = 10
+ISSUE_LOG_FORMATS = ("csv", "ndjson")
+
+
+class GeoJSONStructureError(ValueError):
+    """Raised when a streamed document is valid JSON but not a FeatureCollection"""
+
+
+def _check_structure_events(events, state):
+    """Pass ijson events through, checking for a FeatureCollection with a features array"""
+    first = True
+    for prefix, event, value in events:
+        if first:
+            first = False
+            if event != "start_map":
+                raise GeoJSONStructureError("GeoJSON must be an object")
+        
+        if prefix == "type" and event not in ("map_key", "end_map", "end_array"):
+            state["type"] = value if event == "string" else None
+            if state["type"] != "FeatureCollection":
+                raise GeoJSONStructureError("GeoJSON must have type 'FeatureCollection'")
+        elif prefix == "features" and event not in ("end_array", "end_map", "map_key"):
+            if event != "start_array":
+                raise GeoJSONStructureError("GeoJSON must have a features array")
+            state["has_features"] = True
+        
+        yield prefix, event, value
+    
+    if state.get("type") != "FeatureCollection":
+        raise GeoJSONStructureError("GeoJSON must have type 'FeatureCollection'")
+    if not state.get("has_features"):
+        raise GeoJSONStructureError("GeoJSON must have a features array")
+
+
+def iter_features(file):
+    """Stream features one at a time from a GeoJSON file without loading it whole
+    
+    The file is parsed in a single pass with ijson. Structure problems raise
+    GeoJSONStructureError (possibly only once the stream is exhausted, e.g. when
+    the top-level "type" comes after "features"); JSON syntax errors raise
+    ijson.JSONError.
+    """
+    file.seek(0)
+    state = {}
+    events = _check_structure_events(ijson.parse(file, use_float=True), state)
+    yield from ijson.items(events, "features.item")
+
+
+def stream_clean_features(file):
+    """Yield (index, cleaned_feature, error) for every feature of a GeoJSON file
+    
+    Features are validated one at a time with clean_coordinate_data: the
+    features are Python dicts, so a batched NumPy check still pays for a
+    per-feature extraction and ends up slower (see
+    benchmarks/bench_geovalidation.py).
+    """
+    for index, feature in enumerate(iter_features(file)):
+        feature, error = clean_coordinate_data(feature)
+        yield index, feature, error
+
+
+def clean_coordinate_data(feature):
+    """Clean and validate coordinate data in a feature"""
+    try:
+        geom = feature.get("geometry", {})
+        if geom.get("type") != "Point":
+            return feature, NOT_A_POINT
+            
+        coords = geom.get("coordinates", [])
+        if len(coords) != 2:
+            return feature, INVALID_ARITY
+            
+        # Clean coordinates
+        lon, lat = coords
+        if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+            return feature, OUT_OF_RANGE
+            
+        return feature, None
+        
+    except Exception as e:
+        return feature, f"{CLEANING_ERROR}: {str(e)}"
+
+
+class FeatureCollectionWriter:
+    """Write a GeoJSON FeatureCollection one feature at a time
+    
+    Only the current feature is ever serialized in memory. indent=None gives
+    compact output; an integer gives the same layout as
+    json.dumps(collection, indent=indent). With compress=True the output is
+    gzip-compressed on the fly. Closing the writer does not close fileobj.
+    """
+    
+    def __init__(self, fileobj, indent=None, compress=False):
+        self._gzip = gzip.GzipFile(fileobj=fileobj, mode="wb") if compress else None
+        self._out = self._gzip or fileobj
+        self.indent = indent
+        self.count = 0
+        if indent is None:
+            self._separators = (",", ":")
+            self._out.write(b'{"type":"FeatureCollection","features":[')
+        else:
+            pad = " " * indent
+            self._separators = (",", ": ")
+            self._newline = "\n" + pad * 2
+            self._out.write(
+                f'{{\n{pad}"type": "FeatureCollection",\n{pad}"features": ['.encode("utf-8")
+            )
+    
+    def write(self, feature):
+        """Serialize one feature and append it to the collection"""
+        text = json.dumps(feature, indent=self.indent, separators=self._separators)
+        if self.indent is None:
+            prefix = "," if self.count else ""
+        else:
+            text = text.replace("\n", self._newline)
+            prefix = ("," if self.count else "") + self._newline
+        self._out.write((prefix + text).encode("utf-8"))
+        self.count += 1
+    
+    def close(self):
+        """Terminate the collection and flush the gzip stream, if any"""
+        if self.indent is None:
+            self._out.write(b"]}")
+        else:
+            pad = " " * self.indent
+            closing = f"\n{pad}]\n}}" if self.count else "]\n}"
+            self._out.write(closing.encode("utf-8"))
+        if self._gzip:
+            self._gzip.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        elif self._gzip:
+            self._gzip.close()
+
+
+class IssueCollector:
+    """Aggregate per-feature issues without keeping them all in memory
+    
+    Issues are counted by category, and a bounded reservoir sample of feature
+    indices is kept for each category. When a log file is given, every issue
+    is also streamed to it as CSV (feature,category,message) or NDJSON.
+    """
+    
+    def __init__(
+        self, sample_size=DEFAULT_ISSUE_SAMPLE_SIZE, log=None, log_format="csv", seed=None
+    ):
+        if log_format not in ISSUE_LOG_FORMATS:
+            raise ValueError(f"Unknown issue log format: {log_format}")
+        self.sample_size = sample_size
+        self.counts = Counter()
+        self.samples = {}
+        self._random = random.Random(seed)
+        self._log = None
+        self._csv = None
+        if log is not None:
+            self._log = io.TextIOWrapper(log, encoding="utf-8", newline="", write_through=True)
+            if log_format == "csv":
+                self._csv = csv.writer(self._log)
+                self._csv.writerow(("feature", "category", "message"))
+    
+    @staticmethod
+    def category(message):
+        """Map an issue message to its category"""
+        if message.startswith(CLEANING_ERROR):
+            return CLEANING_ERROR
+        return message
+    
+    @property
+    def total(self):
+        """Total number of issues recorded"""
+        return sum(self.counts.values())
+    
+    def add(self, index, message):
+        """Record the issue of feature `index`"""
+        category = self.category(message)
+        self.counts[category] += 1
+        
+        # Reservoir sampling (algorithm R) of the feature indices
+        sample = self.samples.setdefault(category, [])
+        if len(sample) < self.sample_size:
+            sample.append(index)
+        else:
+            slot = self._random.randrange(self.counts[category])
+            if slot < self.sample_size:
+                sample[slot] = index
+        
+        if self._csv:
+            self._csv.writerow((index, category, message))
+        elif self._log:
+            record = {"feature": index, "category": category, "message": message}
+            self._log.write(json.dumps(record) + "\n")
+    
+    def summary(self):
+        """One row per category: category, count, sorted example feature indices"""
+        return [
+            {
+                "Issue": category,
+                "Count": count,
+                "Example features": ", ".join(map(str, sorted(self.samples[category])))
+            }
+            for category, count in self.counts.most_common()
+        ]
+    
+    def close(self):
+        """Flush the issue log, leaving the underlying binary file open"""
+        if self._log:
+            self._log.flush()
+            self._log.detach()
+            self._log = None
+
+
+def _count(minimum):
+    """argparse type for integers of at least `minimum`"""
+    def parse(value):
+        number = int(value)
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {value}")
+        return number
+    return parse
+
+
+@contextmanager
+def _replace_on_success(path):
+    """Write to a temporary file next to `path`, renamed onto it only if the block succeeds"""
+    target = Path(path)
+    temporary = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        file = open(temporary, "wb")
+    except OSError as e:
+        raise OSError(e.errno, e.strerror, str(target)) from None
+    try:
+        with file:
+            yield file
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+    temporary.replace(target)
+
+
+def run_cli(argv=None):
+    """Validate and clean a GeoJSON file from the command line"""
+    parser = argparse.ArgumentParser(
+        description="Validate and clean a GeoJSON FeatureCollection of Point features"
+    )
+    parser.add_argument("input", help="GeoJSON file to validate")
+    parser.add_argument(
+        "-o", "--output",
+        help="Where to write the cleaned GeoJSON (default: validate only)"
+    )
+    parser.add_argument(
+        "--indent", type=_count(0),
+        help="Indent the cleaned GeoJSON by this many spaces (default: compact)"
+    )
+    parser.add_argument(
+        "--gzip", action="store_true",
+        help="Gzip-compress the cleaned GeoJSON"
+    )
+    parser.add_argument(
+        "--issues",
+        help="Where to write the full list of issues (default: summary only)"
+    )
+    parser.add_argument(
+        "--issue-format", choices=ISSUE_LOG_FORMATS, default="csv",
+        help="Format of the --issues file (default: csv)"
+    )
+    args = parser.parse_args(argv)
+    
+    feature_count = 0
+    try:
+        with ExitStack() as files:
+            output = files.enter_context(_replace_on_success(args.output)) if args.output else None
+            issue_log = files.enter_context(_replace_on_success(args.issues)) if args.issues else None
+            collector = IssueCollector(log=issue_log, log_format=args.issue_format)
+            files.callback(collector.close)
+            with open(args.input, "rb") as file:
+                writer = (
+                    FeatureCollectionWriter(output, indent=args.indent, compress=args.gzip)
+                    if output else None
+                )
+                for i, cleaned_feature, error in stream_clean_features(file):
+                    if error:
+                        collector.add(i, error)
+                    if writer:
+                        writer.write(cleaned_feature)
+                    feature_count += 1
+                if writer:
+                    writer.close()
+    except GeoJSONStructureError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    except ijson.JSONError as e:
+        print(f"Invalid JSON file: {str(e)}", file=sys.stderr)
+        return 1
+    except OSError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    
+    print(f"Processed {feature_count} features, {collector.total} issues")
+    for row in collector.summary():
+        print(f"  {row['Issue']}: {row['Count']} (e.g. features {row['Example features']})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run_cli())
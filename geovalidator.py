@@ -2,10 +2,17 @@ import streamlit as st
 import pandas as pd
 import geopandas as gpd
 from shapely.geometry import Point
-import json
 import io
+import tempfile
 from pathlib import Path
 import ijson  # For handling large JSON files
+from geovalidation import (
+    FeatureCollectionWriter,
+    ISSUE_LOG_FORMATS,
+    GeoJSONStructureError,
+    IssueCollector,
+    stream_clean_features,
+)
 
 st.set_page_config(
     page_title="GeoData Validator",
@@ -14,66 +21,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-def validate_json_file(file):
-    """Validate JSON file and return any errors"""
-    try:
-        # Reset file pointer to start
-        file.seek(0)
-        
-        # Try to parse the JSON file in chunks
-        parser = ijson.parse(file)
-        for prefix, event, value in parser:
-            pass
-        
-        # Reset file pointer again
-        file.seek(0)
-        
-        # If we got here, the JSON is valid
-        data = json.load(file)
-        return data, None
-        
-    except Exception as e:
-        return None, f"Invalid JSON file: {str(e)}"
-
-def validate_geojson_structure(data):
-    """Validate GeoJSON structure and return any errors"""
-    try:
-        if not isinstance(data, dict):
-            return False, "GeoJSON must be an object"
-            
-        if data.get("type") != "FeatureCollection":
-            return False, "GeoJSON must have type 'FeatureCollection'"
-            
-        features = data.get("features")
-        if not isinstance(features, list):
-            return False, "GeoJSON must have a features array"
-            
-        return True, None
-        
-    except Exception as e:
-        return False, f"Error validating GeoJSON structure: {str(e)}"
-
-def clean_coordinate_data(feature):
-    """Clean and validate coordinate data in a feature"""
-    try:
-        geom = feature.get("geometry", {})
-        if geom.get("type") != "Point":
-            return feature, "Not a point geometry"
-            
-        coords = geom.get("coordinates", [])
-        if len(coords) != 2:
-            return feature, "Invalid coordinate array length"
-            
-        # Clean coordinates
-        lon, lat = coords
-        if not (-180 <= lon <= 180 and -90 <= lat <= 90):
-            return feature, "Coordinates out of valid range"
-            
-        return feature, None
-        
-    except Exception as e:
-        return feature, f"Error cleaning coordinates: {str(e)}"
-
 def main():
     st.title("🌍 GeoData Validator and Cleaner")
     st.write("Upload your CSV, JSON, or GeoJSON file to validate and clean geographic data")
@@ -87,68 +34,81 @@ def main():
         - JSON files with coordinate data
         - GeoJSON files with Point features
         """)
+        
+        st.header("Output")
+        indent_output = st.checkbox(
+            "Indent cleaned GeoJSON", value=False,
+            help="Human-readable output; compact output is noticeably smaller"
+        )
+        compress_output = st.checkbox("Gzip-compress download", value=False)
+        issue_format = st.radio("Issue log format", ISSUE_LOG_FORMATS, horizontal=True)
     
     uploaded_file = st.file_uploader("Choose a file", type=['csv', 'json', 'geojson'])
     
     if uploaded_file is not None:
         try:
-            # First validate JSON structure
-            data, json_error = validate_json_file(uploaded_file)
-            
-            if json_error:
-                st.error(json_error)
-                return
-                
-            # Validate GeoJSON structure
-            is_valid, geojson_error = validate_geojson_structure(data)
-            
-            if geojson_error:
-                st.error(geojson_error)
-                return
-                
-            # Process features
-            features = data["features"]
-            clean_features = []
-            issues = []
+            # Single streaming pass: validate structure, clean each feature and
+            # write it straight to disk. The files live in a per-session
+            # temporary directory, removed with the session, so the download
+            # buttons can read them only when clicked.
+            downloads = st.session_state.setdefault(
+                "downloads", tempfile.TemporaryDirectory(prefix="geovalidator-")
+            )
+            output_path = Path(downloads.name) / "cleaned_data.geojson"
+            issue_path = Path(downloads.name) / f"issues.{issue_format}"
+            preview = []
             
-            with st.spinner('Processing features...'):
-                for i, feature in enumerate(features):
-                    cleaned_feature, error = clean_coordinate_data(feature)
-                    if error:
-                        issues.append(f"Feature {i}: {error}")
-                    clean_features.append(cleaned_feature)
+            with st.spinner('Processing features...'), \
+                    open(output_path, "wb") as output, open(issue_path, "wb") as issue_log:
+                issues = IssueCollector(log=issue_log, log_format=issue_format)
+                with FeatureCollectionWriter(
+                    output, indent=2 if indent_output else None, compress=compress_output
+                ) as writer:
+                    for i, cleaned_feature, error in stream_clean_features(uploaded_file):
+                        if error:
+                            issues.add(i, error)
+                        writer.write(cleaned_feature)
+                        if len(preview) < 5:
+                            preview.append(cleaned_feature)
+                feature_count = writer.count
+                issues.close()
             
             # Show results
-            st.success(f"Processed {len(features)} features")
+            st.success(f"Processed {feature_count} features")
             
-            if issues:
-                st.warning("Issues found:")
-                for issue in issues:
-                    st.write(f"- {issue}")
-            
-            # Create output GeoJSON
-            output_geojson = {
-                "type": "FeatureCollection",
-                "features": clean_features
-            }
+            if issues.total:
+                st.warning(f"{issues.total} issues found:")
+                st.dataframe(pd.DataFrame(issues.summary()), hide_index=True)
             
             # Download buttons
             col1, col2 = st.columns(2)
             
             with col1:
-                # GeoJSON download
+                # Deferred downloads: the files are only read when a button is clicked
                 st.download_button(
                     label="Download Cleaned GeoJSON",
-                    data=json.dumps(output_geojson, indent=2),
-                    file_name="cleaned_data.geojson",
-                    mime="application/json"
+                    data=output_path.read_bytes,
+                    file_name="cleaned_data.geojson.gz" if compress_output else "cleaned_data.geojson",
+                    mime="application/gzip" if compress_output else "application/json"
                 )
+                
+                if issues.total:
+                    st.download_button(
+                        label="Download Issue Log",
+                        data=issue_path.read_bytes,
+                        file_name=f"issues.{issue_format}",
+                        mime="text/csv" if issue_format == "csv" else "application/x-ndjson"
+                    )
             
             with col2:
                 # Show preview
                 with st.expander("View first 5 features"):
-                    st.json(clean_features[:5])
-                    
+                    st.json(preview)
+        
+        except GeoJSONStructureError as e:
+            st.error(str(e))
+        except ijson.JSONError as e:
+            st.error(f"Invalid JSON file: {str(e)}")
         except Exception as e:
             st.error(f"An error occurred: {str(e)}")
             st.write("Please check your file format and try again")
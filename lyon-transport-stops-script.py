@@ -1,12 +1,43 @@
 import os
+import json
 import logging
+from contextlib import closing
+from itertools import chain
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import geopandas as gpd
-from shapely.geometry import Point
 import streamlit as st
 
+# Unique location counting modes of RunningStatistics
+DISTINCT_MODES = ('exact', 'approximate')
+# HyperLogLog precision: 2**14 one-byte registers, about 0.8% standard error
+HLL_PRECISION = 14
+
+# CSV parsers: pandas (chunks of rows) or pyarrow (multithreaded, blocks of bytes)
+CSV_ENGINES = ('pandas', 'pyarrow')
+ARROW_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Compact column types for stop files: float32 coordinates (about 1e-6 degree
+# precision, so WKT output may differ in the last decimal) and categorical
+# line codes and accessibility flags. Columns absent from a file are ignored.
+COMPACT_DTYPES = {
+    'lon': 'float32',
+    'lat': 'float32',
+    'desserte': 'category',
+    'pmr': 'category',
+    'ascenseur': 'category',
+    'escalator': 'category',
+}
+# Column type presets offered in the UI
+CSV_SCHEMAS = {'inferred': None, 'compact': COMPACT_DTYPES}
+
+# GeoParquet compression codecs offered ('none' = uncompressed)
+PARQUET_COMPRESSIONS = ('snappy', 'zstd', 'gzip', 'brotli', 'none')
+# CSV chunks are regrouped into Parquet row groups of about this many rows
+PARQUET_ROW_GROUP_SIZE = 65536
+
 def configure_logging():
     """Configure logging for the application"""
     logging.basicConfig(
@@ -14,116 +45,654 @@ def configure_logging():
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
 
-def read_csv_in_chunks(file_path, chunk_size=1000):
+def read_csv_header(file_path):
+    """
+    Read the column names of a CSV file without parsing its rows
+    
+    Args:
+        file_path (str or Path): Path to the CSV file
+    
+    Returns:
+        list: Column names
+    """
+    return list(pd.read_csv(file_path, nrows=0, encoding='utf-8').columns)
+
+def read_csv_in_chunks(file_path, chunk_size=1000, dtype=None, usecols=None, engine='pandas'):
     """
     Read CSV file in chunks with error handling
     
+    The file is read only once: progress comes from the position of the
+    underlying binary file instead of a preliminary line count.
+    
     Args:
         file_path (str or Path): Path to the input CSV file
-        chunk_size (int, optional): Number of rows to read in each chunk. Defaults to 1000.
+        chunk_size (int, optional): Number of rows to read in each chunk (pandas
+            engine; the pyarrow engine reads blocks of ARROW_BLOCK_SIZE bytes). Defaults to 1000.
+        dtype (dict, optional): Column types ('float32', 'category', ...), e.g.
+            COMPACT_DTYPES. Columns absent from the file are ignored. Defaults to inference.
+        usecols (list, optional): Columns to load. Defaults to all columns.
+        engine (str, optional): 'pandas' or 'pyarrow' (multithreaded parsing). Defaults to 'pandas'.
     
     Returns:
-        tuple: A tuple containing chunks iterator and total number of lines
+        tuple: A tuple containing an iterator of (chunk, bytes read so far)
+            and the total size of the file in bytes
     """
     try:
-        # Get total number of lines for progress tracking
-        total_lines = sum(1 for _ in open(file_path, 'r', encoding='utf-8')) - 1
+        if engine not in CSV_ENGINES:
+            raise ValueError(f"Unknown CSV engine: {engine}")
+        total_bytes = os.path.getsize(file_path)
         
-        chunks = pd.read_csv(
-            file_path,
-            chunksize=chunk_size,
-            encoding='utf-8'
-        )
-        return chunks, total_lines
+        f = open(file_path, 'rb')
+        if engine == 'pyarrow':
+            chunks = _read_csv_arrow(f, dtype, usecols)
+        else:
+            chunks = pd.read_csv(
+                f,
+                chunksize=chunk_size,
+                encoding='utf-8',
+                dtype=dtype,
+                usecols=usecols
+            )
+        return _with_bytes_read(chunks, f), total_bytes
     except Exception as e:
         logging.error(f"Error reading CSV file: {e}")
         raise
 
+def _read_csv_arrow(f, dtype=None, usecols=None):
+    """
+    Parse a CSV file with the streaming, multithreaded pyarrow reader
+    
+    Args:
+        f (file): Binary CSV file
+        dtype (dict, optional): Column types, as for read_csv_in_chunks
+        usecols (list, optional): Columns to load
+    
+    Returns:
+        generator: pandas DataFrame chunks
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    
+    column_types = {
+        column: (
+            pa.dictionary(pa.int32(), pa.string()) if kind == 'category'
+            else pa.from_numpy_dtype(np.dtype(kind))
+        )
+        for column, kind in (dtype or {}).items()
+    }
+    reader = pa_csv.open_csv(
+        f,
+        read_options=pa_csv.ReadOptions(use_threads=True, block_size=ARROW_BLOCK_SIZE),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types,
+            include_columns=usecols or []
+        )
+    )
+    
+    def batches():
+        with reader:
+            for batch in reader:
+                yield batch.to_pandas()
+    
+    return batches()
+
+def _with_bytes_read(chunks, f):
+    """
+    Pair each chunk with the position reached in the underlying file
+    
+    Args:
+        chunks (iterable): Chunk reader over `f`, with a close() method
+        f (file): Binary file being parsed, closed once the chunks are exhausted
+    
+    Yields:
+        tuple: (chunk, bytes read so far)
+    """
+    with f, closing(chunks):
+        for chunk in chunks:
+            yield chunk, f.tell()
+
 def create_geometry(df):
     """
     Create geometry points from latitude and longitude
     
+    Points are built in one vectorized call rather than one Point per row.
+    
     Args:
         df (pandas.DataFrame): DataFrame with 'lon' and 'lat' columns
     
     Returns:
-        list: List of Shapely Point geometries
+        geopandas.array.GeometryArray: Array of Shapely Point geometries
     """
     try:
-        geometry = [Point(xy) for xy in zip(df['lon'], df['lat'])]
+        geometry = gpd.points_from_xy(df['lon'], df['lat'])
         return geometry
     except Exception as e:
         logging.error(f"Error creating geometry: {e}")
         raise
 
-def process_data(input_file, output_file):
+def serialize_geometry(geometry, geometry_format='wkt'):
+    """
+    Convert a geometry column to text for CSV storage
+    
+    Args:
+        geometry (geopandas.GeoSeries): Geometry column
+        geometry_format (str, optional): 'wkt' (same text as str(point)) or
+            'wkb' (hex-encoded). Defaults to 'wkt'.
+    
+    Returns:
+        pandas.Series: Serialized geometries
+    """
+    if geometry_format == 'wkt':
+        return geometry.to_wkt()
+    if geometry_format == 'wkb':
+        return geometry.to_wkb(hex=True)
+    raise ValueError(f"Unknown geometry format: {geometry_format}")
+
+class RunningStatistics:
+    """
+    Summary statistics accumulated chunk by chunk
+    
+    Only counters are kept, never the rows themselves. Unique locations are
+    counted exactly with a set of 64-bit (lat, lon) hashes, or approximately
+    with a HyperLogLog sketch of fixed size (about 1% error).
+    """
+    
+    def __init__(self, distinct='exact', precision=HLL_PRECISION):
+        """
+        Args:
+            distinct (str, optional): 'exact' (hash set) or 'approximate'
+                (HyperLogLog). Defaults to 'exact'.
+            precision (int, optional): HyperLogLog precision, 2**precision registers
+        """
+        if distinct not in DISTINCT_MODES:
+            raise ValueError(f"Unknown distinct counting mode: {distinct}")
+        self.distinct = distinct
+        self.precision = precision
+        self.record_count = 0
+        self.columns = {}
+        self._hashes = set()
+        self._registers = np.zeros(1 << precision, dtype=np.uint8)
+    
+    def update(self, df):
+        """
+        Add the rows of a processed chunk
+        
+        Args:
+            df (pandas.DataFrame): Chunk with 'lat' and 'lon' columns
+        """
+        self.record_count += len(df)
+        for column in df.columns:
+            dtype, non_null = self.columns.get(column, (str(df[column].dtype), 0))
+            self.columns[column] = (dtype, non_null + int(df[column].notna().sum()))
+        
+        # Same locations as df.groupby(['lat', 'lon']): rows with a missing
+        # coordinate are ignored and -0.0 counts as 0.0
+        locations = df[['lat', 'lon']].dropna() + 0.0
+        hashes = pd.util.hash_pandas_object(locations, index=False).to_numpy()
+        if self.distinct == 'exact':
+            self._hashes.update(hashes.tolist())
+        else:
+            self._add_to_sketch(hashes)
+    
+    def _add_to_sketch(self, hashes):
+        """Update the HyperLogLog registers with 64-bit hashes"""
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        
+        # Bit length of the remaining bits (exact, unlike a float log2)
+        bit_length = np.zeros(len(rest), dtype=np.uint8)
+        for shift in (32, 16, 8, 4, 2, 1):
+            wide = rest >= np.uint64(1 << shift)
+            rest[wide] >>= np.uint64(shift)
+            bit_length[wide] += shift
+        bit_length += (rest > 0).astype(np.uint8)
+        
+        rank = (64 - p + 1 - bit_length).astype(np.uint8)
+        np.maximum.at(self._registers, index, rank)
+    
+    @property
+    def unique_locations(self):
+        """Number of distinct (lat, lon) pairs (estimated in approximate mode)"""
+        if self.distinct == 'exact':
+            return len(self._hashes)
+        
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self._registers.astype(int)))
+        empty = int(np.count_nonzero(self._registers == 0))
+        if estimate <= 2.5 * m and empty:
+            # Small range correction (linear counting)
+            estimate = m * np.log(m / empty)
+        return int(round(estimate))
+
+def iter_processed_chunks(input_file, dtype=None, usecols=None, engine='pandas'):
+    """
+    Read the input CSV chunk by chunk and add a point geometry to each chunk
+    
+    Args:
+        input_file (str or Path): Path to the input CSV file
+        dtype (dict, optional): Column types (see read_csv_in_chunks)
+        usecols (list, optional): Columns to load. Defaults to all columns.
+        engine (str, optional): 'pandas' or 'pyarrow'. Defaults to 'pandas'.
+    
+    Yields:
+        geopandas.GeoDataFrame: Chunk with its geometry column
+    """
+    chunks, total_bytes = read_csv_in_chunks(
+        input_file, dtype=dtype, usecols=usecols, engine=engine
+    )
+    
+    # Streamlit progress bar
+    progress_bar = st.progress(0)
+    rows = 0
+    
+    for chunk, bytes_read in chunks:
+        # Validate lat/lon columns
+        if 'lat' not in chunk.columns or 'lon' not in chunk.columns:
+            raise ValueError("Required columns 'lat' and 'lon' not found in CSV")
+        
+        # Create GeoDataFrame
+        geometry = create_geometry(chunk)
+        yield gpd.GeoDataFrame(chunk, geometry=geometry, crs="EPSG:4326")
+        
+        # Update progress bar from the share of the file consumed
+        rows += len(chunk)
+        progress_bar.progress(
+            min(bytes_read / total_bytes, 1.0) if total_bytes else 1.0,
+            text=f"{rows:,} rows processed"
+        )
+
+def write_csv(chunks, output_file, geometry_format='wkt'):
+    """
+    Append each chunk to a CSV file as soon as it is processed
+    
+    Args:
+        chunks (iterable): GeoDataFrame chunks
+        output_file (str or Path): Path to the output CSV file
+        geometry_format (str, optional): 'wkt' or 'wkb' geometry column. Defaults to 'wkt'.
+    """
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        for i, gdf in enumerate(chunks):
+            # Convert geometry to WKT (or WKB) format for CSV storage
+            df = pd.DataFrame(gdf)
+            df['geometry'] = serialize_geometry(gdf['geometry'], geometry_format)
+            df.to_csv(f, index=False, header=(i == 0))
+
+def _to_arrow(gdf):
+    """
+    Convert a chunk to an Arrow table with a WKB geometry column
+    
+    Categorical columns get int32 dictionary indices: pandas picks int8 or
+    int16 codes depending on the number of categories in each chunk, which
+    would give chunks of the same file different schemas.
+    
+    Args:
+        gdf (geopandas.GeoDataFrame): Processed chunk
+    
+    Returns:
+        pyarrow.Table: Attribute columns followed by 'geometry'
+    """
+    import pyarrow as pa
+    
+    table = pa.Table.from_pandas(
+        pd.DataFrame(gdf.drop(columns='geometry')), preserve_index=False
+    )
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type) and field.type.index_type != pa.int32():
+            dictionary = pa.dictionary(pa.int32(), field.type.value_type, field.type.ordered)
+            table = table.set_column(i, field.name, table.column(i).cast(dictionary))
+    geometry = pa.array(gdf['geometry'].to_wkb(), type=pa.binary())
+    return table.append_column('geometry', geometry).replace_schema_metadata(None)
+
+def _iter_arrow_tables(chunks):
+    """
+    Convert chunks to Arrow tables sharing the first chunk's schema
+    
+    Parquet and FlatGeobuf writers are opened on the first chunk's schema,
+    so each later chunk is cast to it as it arrives. Column types inferred
+    per chunk can drift (a code column numeric in the first rows and
+    alphanumeric later); a drift that cannot be cast losslessly stops the
+    write with a ValueError naming the columns.
+    
+    Args:
+        chunks (iterable): GeoDataFrame chunks (at least one)
+    
+    Yields:
+        pyarrow.Table: One table per chunk
+    
+    Raises:
+        ValueError: If a chunk cannot be cast to the first chunk's schema
+    """
+    import pyarrow as pa
+    
+    schema = None
+    for i, gdf in enumerate(chunks):
+        table = _to_arrow(gdf)
+        if schema is None:
+            schema = table.schema
+        elif not table.schema.equals(schema):
+            try:
+                table = table.cast(schema)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                drifted = ', '.join(
+                    f"{field.name} ({schema.field(field.name).type} -> {field.type})"
+                    for field in table.schema
+                    if field.name in schema.names and field.type != schema.field(field.name).type
+                )
+                raise ValueError(
+                    f"Chunk {i} cannot be cast to the column types of the first chunk: "
+                    f"{drifted or e}. Declare the column types (dtype) or write CSV."
+                ) from e
+        yield table
+
+def write_geoparquet(chunks, output_file, compression='snappy'):
+    """
+    Write chunks to a GeoParquet file with WKB geometries
+    
+    Chunks are regrouped into row groups of about PARQUET_ROW_GROUP_SIZE
+    rows, so at most one row group is held in memory.
+    
+    Args:
+        chunks (iterable): GeoDataFrame chunks (at least one)
+        output_file (str or Path): Path to the output Parquet file
+        compression (str, optional): One of PARQUET_COMPRESSIONS. Defaults to 'snappy'.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    if compression not in PARQUET_COMPRESSIONS:
+        raise ValueError(f"Unknown Parquet compression: {compression}")
+    
+    chunks = iter(chunks)
+    first = next(chunks)
+    geo_metadata = {
+        'version': '1.0.0',
+        'primary_column': 'geometry',
+        'columns': {
+            'geometry': {
+                'encoding': 'WKB',
+                'geometry_types': ['Point'],
+                'crs': first.crs.to_json_dict(),
+            }
+        },
+    }
+    
+    writer = None
+    pending = []
+    pending_rows = 0
+    try:
+        for table in _iter_arrow_tables(chain([first], chunks)):
+            if writer is None:
+                schema = table.schema.with_metadata({'geo': json.dumps(geo_metadata)})
+                writer = pq.ParquetWriter(
+                    output_file,
+                    schema,
+                    compression=None if compression == 'none' else compression
+                )
+            pending.append(table.replace_schema_metadata(schema.metadata))
+            pending_rows += len(table)
+            if pending_rows >= PARQUET_ROW_GROUP_SIZE:
+                writer.write_table(pa.concat_tables(pending))
+                pending, pending_rows = [], 0
+        if pending:
+            writer.write_table(pa.concat_tables(pending))
+    finally:
+        if writer is not None:
+            writer.close()
+
+def write_flatgeobuf(chunks, output_file, spatial_index=True):
+    """
+    Stream chunks into a FlatGeobuf file through a single GDAL write
+    
+    Args:
+        chunks (iterable): GeoDataFrame chunks (at least one)
+        output_file (str or Path): Path to the output FlatGeobuf file
+        spatial_index (bool, optional): Write a packed R-tree so bounding box
+            reads skip unrelated features; features are then stored in
+            spatial (Hilbert) order instead of input order. Defaults to True.
+    """
+    import pyarrow as pa
+    import pyogrio
+    
+    # Appending with to_file(mode='a') rewrites the file for every chunk;
+    # a record batch stream is written in one pass instead
+    tables = _iter_arrow_tables(chunks)
+    first = next(tables)
+    errors = []
+    
+    def batches():
+        # GDAL reports a failing stream as a generic RuntimeError: keep the
+        # original error (e.g. a chunk schema drift) to raise it instead
+        try:
+            for table in chain([first], tables):
+                yield from table.to_batches()
+        except ValueError as e:
+            errors.append(e)
+            raise
+    
+    try:
+        pyogrio.write_arrow(
+            pa.RecordBatchReader.from_batches(first.schema, batches()),
+            output_file,
+            driver='FlatGeobuf',
+            geometry_name='geometry',
+            geometry_type='Point',
+            crs='EPSG:4326',
+            SPATIAL_INDEX='YES' if spatial_index else 'NO'
+        )
+    except RuntimeError:
+        if errors:
+            raise errors[0] from None
+        raise
+
+# Output writers by format: (writer, file extension, MIME type)
+OUTPUT_FORMATS = {
+    'csv': (write_csv, '.csv', 'text/csv'),
+    'geoparquet': (write_geoparquet, '.parquet', 'application/vnd.apache.parquet'),
+    'flatgeobuf': (write_flatgeobuf, '.fgb', 'application/octet-stream'),
+}
+
+def process_data(input_file, output_file, geometry_format='wkt', output_format='csv',
+                 distinct='exact', compression='snappy', spatial_index=True,
+                 dtype=None, usecols=None, engine='pandas'):
     """
-    Process the input CSV file and create a GeoDataFrame with geometry
+    Process the input CSV file chunk by chunk and stream the result to disk
+    
+    Each chunk is written as soon as it is processed and only running
+    statistics are kept, so memory stays flat whatever the input size.
     
     Args:
         input_file (str or Path): Path to the input CSV file
-        output_file (str or Path): Path to save the output CSV file
+        output_file (str or Path): Path to save the output file
+        geometry_format (str, optional): 'wkt' or 'wkb' geometry column (CSV only). Defaults to 'wkt'.
+        output_format (str, optional): 'csv', 'geoparquet' or 'flatgeobuf'. Defaults to 'csv'.
+        distinct (str, optional): 'exact' or 'approximate' unique location count. Defaults to 'exact'.
+        compression (str, optional): GeoParquet compression codec. Defaults to 'snappy'.
+        spatial_index (bool, optional): Index FlatGeobuf output. Defaults to True.
+        dtype (dict, optional): Column types, e.g. COMPACT_DTYPES. Defaults to inference.
+        usecols (list, optional): Input columns to keep. Defaults to all columns.
+        engine (str, optional): 'pandas' or 'pyarrow' CSV parser. Defaults to 'pandas'.
     
     Returns:
-        pandas.DataFrame: Processed DataFrame with geometry
+        tuple: First rows of the processed data and the RunningStatistics
     """
     try:
         # Verify input file exists
         if not os.path.exists(input_file):
             raise FileNotFoundError(f"Input file not found at {input_file}")
-
-        chunks, total_lines = read_csv_in_chunks(input_file)
-        processed_chunks = []
-        
-        # Streamlit progress bar
-        progress_bar = st.progress(0)
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
         
-        for i, chunk in enumerate(chunks):
-            # Validate lat/lon columns
-            if 'lat' not in chunk.columns or 'lon' not in chunk.columns:
-                raise ValueError("Required columns 'lat' and 'lon' not found in CSV")
-            
-            # Create GeoDataFrame
-            geometry = create_geometry(chunk)
-            gdf = gpd.GeoDataFrame(chunk, geometry=geometry, crs="EPSG:4326")
-            
-            # Convert geometry to WKT format for CSV storage
-            gdf['geometry'] = gdf['geometry'].astype(str)
-            
-            processed_chunks.append(gdf)
-            
-            # Update progress bar
-            progress_bar.progress((i + 1) / total_lines)
+        statistics = RunningStatistics(distinct)
+        chunks = iter_processed_chunks(input_file, dtype, usecols, engine)
+        first = next(chunks, None)
+        if first is None:
+            raise ValueError("No data rows found in CSV")
+        preview = first.head().copy()
+        preview['geometry'] = serialize_geometry(preview['geometry'], geometry_format)
         
-        # Combine all chunks
-        final_df = pd.concat(processed_chunks, ignore_index=True)
+        def tracked(chunks):
+            for gdf in chunks:
+                statistics.update(gdf)
+                yield gdf
         
-        # Save to CSV
-        final_df.to_csv(output_file, index=False, encoding='utf-8')
+        writer = OUTPUT_FORMATS[output_format][0]
+        options = {
+            'csv': {'geometry_format': geometry_format},
+            'geoparquet': {'compression': compression},
+            'flatgeobuf': {'spatial_index': spatial_index},
+        }[output_format]
+        writer(tracked(chain([first], chunks)), output_file, **options)
         st.success(f"Successfully saved processed data to {output_file}")
         
-        return final_df
+        return pd.DataFrame(preview), statistics
         
     except Exception as e:
         st.error(f"Error in data processing: {e}")
         raise
 
-def display_summary_statistics(df):
+def _to_geodataframe(df, geometry_column, crs):
+    """
+    Build a GeoDataFrame from a batch whose geometry column holds WKB
+    
+    Args:
+        df (pandas.DataFrame): Batch read from a processed file
+        geometry_column (str): Name of the WKB column
+        crs: Coordinate reference system of the file
+    
+    Returns:
+        geopandas.GeoDataFrame: Batch with a 'geometry' column
+    """
+    geometry = gpd.GeoSeries.from_wkb(df[geometry_column].to_numpy(), index=df.index, crs=crs)
+    return gpd.GeoDataFrame(df.drop(columns=geometry_column), geometry=geometry)
+
+def _iter_geoparquet(path, columns, bbox, batch_size):
+    """Yield GeoDataFrame batches of a GeoParquet file (see iter_processed_stops)"""
+    import pyarrow.dataset as ds
+    from pyproj import CRS
+    
+    dataset = ds.dataset(path, format='parquet')
+    geo_metadata = json.loads(dataset.schema.metadata[b'geo'])
+    geometry_column = geo_metadata['primary_column']
+    crs = CRS.from_json_dict(geo_metadata['columns'][geometry_column]['crs'])
+    if columns is None:
+        columns = [name for name in dataset.schema.names if name != geometry_column]
+    
+    # Row groups whose lon/lat statistics fall outside the box are skipped
+    row_filter = None
+    if bbox is not None:
+        minx, miny, maxx, maxy = bbox
+        row_filter = (
+            (ds.field('lon') >= minx) & (ds.field('lon') <= maxx)
+            & (ds.field('lat') >= miny) & (ds.field('lat') <= maxy)
+        )
+    
+    for batch in dataset.to_batches(
+        columns=list(columns) + [geometry_column], filter=row_filter, batch_size=batch_size
+    ):
+        yield _to_geodataframe(batch.to_pandas(), geometry_column, crs)
+
+def _iter_flatgeobuf(path, columns, bbox, batch_size):
+    """Yield GeoDataFrame batches of a FlatGeobuf file (see iter_processed_stops)"""
+    import pyogrio
+    
+    # The bounding box is resolved with the file's spatial index, if any
+    with pyogrio.open_arrow(
+        path, columns=columns, bbox=bbox, batch_size=batch_size, use_pyarrow=True
+    ) as (meta, reader):
+        geometry_column = meta['geometry_name'] or 'wkb_geometry'
+        for batch in reader:
+            yield _to_geodataframe(batch.to_pandas(), geometry_column, meta['crs'])
+
+def _iter_csv(path, columns, bbox, batch_size):
+    """Yield GeoDataFrame batches of a processed CSV file (see iter_processed_stops)"""
+    usecols = None
+    if columns is not None:
+        usecols = set(columns) | {'geometry'} | ({'lon', 'lat'} if bbox is not None else set())
+    
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=batch_size, encoding='utf-8'):
+        if bbox is not None:
+            minx, miny, maxx, maxy = bbox
+            chunk = chunk[chunk['lon'].between(minx, maxx) & chunk['lat'].between(miny, maxy)]
+        text = chunk.pop('geometry')
+        if text.str.startswith('POINT').all():
+            geometry = gpd.GeoSeries.from_wkt(text, crs="EPSG:4326")
+        else:
+            geometry = gpd.GeoSeries.from_wkb(text, crs="EPSG:4326")
+        if columns is not None:
+            chunk = chunk[list(columns)]
+        yield gpd.GeoDataFrame(chunk, geometry=geometry)
+
+# Lazy readers by file extension
+PROCESSED_READERS = {
+    '.parquet': _iter_geoparquet,
+    '.fgb': _iter_flatgeobuf,
+    '.csv': _iter_csv,
+}
+
+def iter_processed_stops(path, columns=None, bbox=None, batch_size=PARQUET_ROW_GROUP_SIZE):
+    """
+    Load a file written by process_data lazily, one batch at a time
+    
+    Only the requested columns are read from disk (the geometry is always
+    loaded), and GeoParquet / FlatGeobuf files skip the data outside `bbox`
+    without decoding it.
+    
+    Args:
+        path (str or Path): Processed .parquet, .fgb or .csv file
+        columns (list, optional): Attribute columns to load. Defaults to all of them.
+        bbox (tuple, optional): (min lon, min lat, max lon, max lat) filter
+        batch_size (int, optional): Maximum number of rows per batch
+    
+    Yields:
+        geopandas.GeoDataFrame: Batches of stops
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in PROCESSED_READERS:
+        raise ValueError(f"Unsupported processed file type: {suffix}")
+    yield from PROCESSED_READERS[suffix](path, columns, bbox, batch_size)
+
+def read_processed_stops(path, columns=None, bbox=None):
+    """
+    Load a file written by process_data into a single GeoDataFrame
+    
+    Args:
+        path (str or Path): Processed .parquet, .fgb or .csv file
+        columns (list, optional): Attribute columns to load. Defaults to all of them.
+        bbox (tuple, optional): (min lon, min lat, max lon, max lat) filter
+    
+    Returns:
+        geopandas.GeoDataFrame: Loaded stops
+    """
+    batches = list(iter_processed_stops(path, columns, bbox))
+    if not batches:
+        return gpd.GeoDataFrame(columns=list(columns or []) + ['geometry'], crs="EPSG:4326")
+    return pd.concat(batches, ignore_index=True)
+
+def display_summary_statistics(statistics):
     """
     Display summary statistics of the processed data
     
     Args:
-        df (pandas.DataFrame): Processed DataFrame
+        statistics (RunningStatistics): Statistics gathered while processing
     """
     st.subheader("Summary Statistics")
-    st.write(f"Total number of records: {len(df)}")
-    st.write(f"Number of unique locations: {len(df.groupby(['lat', 'lon']))}")
+    st.write(f"Total number of records: {statistics.record_count}")
+    approximate = "≈ " if statistics.distinct == 'approximate' else ""
+    st.write(f"Number of unique locations: {approximate}{statistics.unique_locations}")
     
-    # Display DataFrame information
+    # Display column information
     st.subheader("Column Information")
-    buffer = []
-    df.info(buf=buffer)
-    st.text('\n'.join(buffer))
+    st.dataframe(
+        pd.DataFrame(
+            [
+                {'Column': column, 'Non-Null Count': non_null, 'Dtype': dtype}
+                for column, (dtype, non_null) in statistics.columns.items()
+            ]
+        ),
+        hide_index=True
+    )
 
 def main():
     """
@@ -141,10 +710,67 @@ def main():
         help="Upload the Lyon public transport stops CSV file"
     )
     
+    geometry_format = st.radio(
+        "Geometry output format",
+        ['wkt', 'wkb'],
+        format_func=str.upper,
+        horizontal=True,
+        help="WKT is human-readable; WKB (hex) is more compact and exact"
+    )
+    
+    output_format = st.selectbox(
+        "Output format",
+        list(OUTPUT_FORMATS),
+        format_func={'csv': 'CSV', 'geoparquet': 'GeoParquet', 'flatgeobuf': 'FlatGeobuf'}.get,
+        help="Chunks are appended to the output file as they are processed"
+    )
+    
+    distinct = st.radio(
+        "Unique location count",
+        DISTINCT_MODES,
+        format_func=str.capitalize,
+        horizontal=True,
+        help="Approximate mode uses a fixed-size HyperLogLog sketch instead of a hash set"
+    )
+    
+    schema = st.selectbox(
+        "Column types",
+        list(CSV_SCHEMAS),
+        format_func={
+            'inferred': 'Inferred (exact coordinates)',
+            'compact': 'Compact (float32 coordinates, categorical codes)',
+        }.get,
+        help="Compact types cut memory per chunk; float32 keeps about 1e-6 degree of precision"
+    )
+    
+    engine = st.radio(
+        "CSV parser",
+        CSV_ENGINES,
+        format_func={'pandas': 'pandas', 'pyarrow': 'pyarrow (multithreaded)'}.get,
+        horizontal=True
+    )
+    
+    compression = 'snappy'
+    spatial_index = True
+    if output_format == 'geoparquet':
+        compression = st.selectbox(
+            "GeoParquet compression",
+            PARQUET_COMPRESSIONS,
+            help="zstd gives smaller files, snappy the fastest reads and writes"
+        )
+    elif output_format == 'flatgeobuf':
+        spatial_index = st.checkbox(
+            "Build spatial index",
+            value=True,
+            help="Speeds up bounding box reads; features are stored in spatial order"
+        )
+    
     if uploaded_file is not None:
         # Temporary file paths
         input_file = Path.home() / 'Downloads' / 'input_transport_stops.csv'
-        output_file = Path.home() / 'Downloads' / 'lyon_transport_stops_with_geometry.csv'
+        _, extension, mime = OUTPUT_FORMATS[output_format]
+        output_name = f'lyon_transport_stops_with_geometry{extension}'
+        output_file = Path.home() / 'Downloads' / output_name
         
         # Save uploaded file
         with open(input_file, 'wb') as f:
@@ -152,22 +778,36 @@ def main():
         
         # Process the data
         try:
-            result_df = process_data(input_file, output_file)
+            columns = read_csv_header(input_file)
+            selected = st.multiselect(
+                "Columns to keep",
+                columns,
+                default=columns,
+                help="Unselected columns are never parsed; 'lat' and 'lon' are always kept"
+            )
+            usecols = None
+            if set(selected) != set(columns):
+                usecols = [c for c in columns if c in selected or c in ('lat', 'lon')]
+            
+            preview, statistics = process_data(
+                input_file, output_file, geometry_format, output_format, distinct,
+                compression, spatial_index, CSV_SCHEMAS[schema], usecols, engine
+            )
             
             # Display sample of processed data
             st.subheader("Sample of Processed Data")
-            st.dataframe(result_df.head())
+            st.dataframe(preview)
             
             # Display summary statistics
-            display_summary_statistics(result_df)
+            display_summary_statistics(statistics)
             
             # Optional: Provide download link for processed file
             with open(output_file, 'rb') as f:
                 st.download_button(
-                    label="Download Processed CSV",
+                    label="Download Processed File",
                     data=f,
-                    file_name='lyon_transport_stops_with_geometry.csv',
-                    mime='text/csv'
+                    file_name=output_name,
+                    mime=mime
                 )
         
         except Exception as e:
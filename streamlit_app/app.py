@@ -4,7 +4,9 @@ Application de démonstration avec réponses mockées
 """
 
 import streamlit as st
-from src.generation_mock import generate_response, get_available_questions
+from src.generation_mock import (
+    EVENT_CONFIDENCE, EVENT_SOURCES, EVENT_TOKEN, get_available_questions, stream_response
+)
 from src.permissions import get_user_permissions, USERS
 from src.retrieval_mock import count_accessible_documents
 from src.utils import calculate_confidence_display, format_source_metadata, truncate_text
@@ -198,59 +200,67 @@ if prompt := st.chat_input("💬 Posez votre question ici..."):
     
     # Générer la réponse de l'assistant
     with st.chat_message("assistant"):
-        with st.spinner("🔍 Recherche dans la knowledge base..."):
-            # Récupérer les permissions de l'utilisateur actuel
-            user_permissions = get_user_permissions(st.session_state.current_user)
-            
-            # Générer la réponse mockée
-            response, sources, confidence = generate_response(
+        # Récupérer les permissions de l'utilisateur actuel
+        user_permissions = get_user_permissions(st.session_state.current_user)
+        
+        # Événements de fin de flux (sources, confiance)
+        trailing_events = {}
+        
+        def response_chunks():
+            for event, payload in stream_response(
                 prompt,
                 user_permissions,
                 st.session_state.messages
-            )
-            
-            # Afficher la réponse
-            st.markdown(response)
-            
-            # Afficher le score de confiance
+            ):
+                if event == EVENT_TOKEN:
+                    yield payload
+                else:
+                    trailing_events[event] = payload
+        
+        # Afficher la réponse au fil de l'eau
+        response = st.write_stream(response_chunks())
+        sources = trailing_events.get(EVENT_SOURCES, [])
+        confidence = trailing_events.get(EVENT_CONFIDENCE, "none")
+        
+        # Afficher le score de confiance
+        st.markdown("---")
+        emoji, message_conf, color = calculate_confidence_display(confidence)
+        
+        if color == "success":
+            st.success(f"{emoji} **{message_conf}**")
+        elif color == "warning":
+            st.warning(f"{emoji} **{message_conf}**")
+        elif color == "error":
+            st.error(f"{emoji} **{message_conf}**")
+        else:
+            st.info(f"{emoji} **{message_conf}**")
+        
+        # Boutons de feedback
+        col1, col2, col3, col4 = st.columns([1, 1, 1, 7])
+        with col1:
+            if st.button("👍", key=f"like_{len(st.session_state.messages)}"):
+                st.toast("✅ Merci pour votre feedback positif !", icon="👍")
+        with col2:
+            if st.button("👎", key=f"dislike_{len(st.session_state.messages)}"):
+                st.toast("📝 Merci, nous allons améliorer cette réponse", icon="👎")
+        with col3:
+            if st.button("📋", key=f"copy_{len(st.session_state.messages)}"):
+                st.toast("📋 Réponse copiée dans le presse-papier", icon="📋")
+        
+        # Afficher les sources si disponibles
+        if sources:
             st.markdown("---")
-            emoji, message_conf, color = calculate_confidence_display(confidence)
-            
-            if color == "success":
-                st.success(f"{emoji} **{message_conf}**")
-            elif color == "warning":
-                st.warning(f"{emoji} **{message_conf}**")
-            elif color == "error":
-                st.error(f"{emoji} **{message_conf}**")
-            else:
-                st.info(f"{emoji} **{message_conf}**")
-            
-            # Boutons de feedback
-            col1, col2, col3, col4 = st.columns([1, 1, 1, 7])
-            with col1:
-                if st.button("👍", key=f"like_{len(st.session_state.messages)}"):
-                    st.toast("✅ Merci pour votre feedback positif !", icon="👍")
-            with col2:
-                if st.button("👎", key=f"dislike_{len(st.session_state.messages)}"):
-                    st.toast("📝 Merci, nous allons améliorer cette réponse", icon="👎")
-            with col3:
-                if st.button("📋", key=f"copy_{len(st.session_state.messages)}"):
-                    st.toast("📋 Réponse copiée dans le presse-papier", icon="📋")
-            
-            # Afficher les sources si disponibles
-            if sources:
-                st.markdown("---")
-                with st.expander(f"📚 **Sources utilisées** ({len(sources)})", expanded=False):
-                    for i, source in enumerate(sources):
-                        st.markdown(f"**[Source {i+1}] {source['title']}**")
-                        st.caption(format_source_metadata(source))
-                        
-                        # Afficher un extrait du contenu
-                        with st.container():
-                            st.markdown(f"*{truncate_text(source['content'], 250)}*")
-                        
-                        if i < len(sources) - 1:
-                            st.markdown("")
+            with st.expander(f"📚 **Sources utilisées** ({len(sources)})", expanded=False):
+                for i, source in enumerate(sources):
+                    st.markdown(f"**[Source {i+1}] {source['title']}**")
+                    st.caption(format_source_metadata(source))
+                    
+                    # Afficher un extrait du contenu
+                    with st.container():
+                        st.markdown(f"*{truncate_text(source['content'], 250)}*")
+                    
+                    if i < len(sources) - 1:
+                        st.markdown("")
     
     # Sauvegarder la réponse dans l'historique
     st.session_state.messages.append({
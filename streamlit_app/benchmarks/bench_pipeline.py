@@ -0,0 +1,365 @@
+"""
+Benchmark du pipeline Mayday Assistant
+Génère des corpus synthétiques (schéma de mock_documents.json) et des
+intentions (schéma de mock_responses.json), puis mesure la latence
+(p50/p95/p99), le débit et la mémoire de retrieve_documents,
+generate_response et count_accessible_documents
+
+Usage (depuis streamlit_app/) :
+    python benchmarks/bench_pipeline.py --sizes 1000 10000 100000 --output bench.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import data_store  # noqa: E402
+from src.generation_mock import generate_response, get_intent_matcher  # noqa: E402
+from src.permissions import USERS, get_user_permissions  # noqa: E402
+from src.result_cache import RESULT_CACHE  # noqa: E402
+from src.retrieval_mock import (  # noqa: E402
+    SCORING_MODES, count_accessible_documents, get_bm25_index, get_index,
+    get_team_histogram, retrieve_documents
+)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TEAMS = ["RH", "Finance", "Legal", "IT", "Support", "Self-Care", "Academy"]
+PRODUCTS = ["Knowledge", "Helpdesk", "Academy", "CRM"]
+CATEGORIES = ["Procédures", "Politiques", "FAQ", "Dépannage", "Formation"]
+CONFIDENCES = ["high", "medium", "low"]
+
+
+def make_vocabulary(size: int, rng: random.Random) -> List[str]:
+    """
+    Génère un vocabulaire de pseudo-mots
+
+    Args:
+        size: Nombre de mots
+        rng: Générateur aléatoire
+
+    Returns:
+        Liste de mots distincts
+    """
+    syllables = ["ra", "mo", "bu", "ti", "ge", "ne", "lo", "pa", "su", "ve", "cha", "tion"]
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+class ZipfSampler:
+    """Tirage de mots selon une loi de Zipf (fréquences proches d'un vrai corpus)"""
+
+    def __init__(self, vocabulary: Sequence[str], rng: random.Random, exponent: float = 1.1):
+        self.vocabulary = vocabulary
+        self.rng = rng
+        self.cum_weights = list(itertools.accumulate(
+            1.0 / (rank + 1) ** exponent for rank in range(len(vocabulary))
+        ))
+
+    def sample(self, k: int) -> List[str]:
+        return self.rng.choices(self.vocabulary, cum_weights=self.cum_weights, k=k)
+
+
+def make_documents(n_documents: int, sampler: ZipfSampler, rng: random.Random) -> List[Dict]:
+    """
+    Génère un corpus synthétique au format mock_documents.json
+
+    Args:
+        n_documents: Nombre de documents
+        sampler: Tirage des mots
+        rng: Générateur aléatoire
+
+    Returns:
+        Liste de documents
+    """
+    documents = []
+    for i in range(n_documents):
+        documents.append({
+            "id": f"kb_{i:07d}",
+            "title": " ".join(sampler.sample(rng.randint(4, 8))).capitalize(),
+            "content": " ".join(sampler.sample(rng.randint(50, 120))),
+            "product": rng.choice(PRODUCTS),
+            "team": rng.choice(TEAMS),
+            "category": rng.choice(CATEGORIES),
+            "last_updated": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "keywords": sorted(set(sampler.sample(rng.randint(5, 8))))
+        })
+    return documents
+
+
+def make_responses(
+    n_intents: int,
+    patterns_per_intent: int,
+    documents: Sequence[Dict],
+    sampler: ZipfSampler,
+    rng: random.Random
+) -> Dict[str, Dict]:
+    """
+    Génère des intentions au format mock_responses.json
+
+    Args:
+        n_intents: Nombre d'intentions
+        patterns_per_intent: Nombre de query_patterns par intention
+        documents: Corpus (pour les sources)
+        sampler: Tirage des mots
+        rng: Générateur aléatoire
+
+    Returns:
+        Dictionnaire {clé: réponse}
+    """
+    responses = {}
+    for i in range(n_intents):
+        n_sources = min(len(documents), rng.randint(10, 30))
+        required_teams = rng.sample(TEAMS, rng.randint(0, 2))
+        responses[f"intent_{i:05d}"] = {
+            "query_patterns": [
+                " ".join(sampler.sample(rng.randint(1, 3)))
+                for _ in range(patterns_per_intent)
+            ],
+            "response": " ".join(sampler.sample(rng.randint(150, 300))),
+            "sources": [doc["id"] for doc in rng.sample(list(documents), n_sources)],
+            "confidence": rng.choice(CONFIDENCES),
+            "required_teams": required_teams
+        }
+    return responses
+
+
+def make_queries(
+    n_queries: int,
+    responses: Dict[str, Dict],
+    sampler: ZipfSampler,
+    rng: random.Random
+) -> List[str]:
+    """
+    Génère des questions : moitié dérivées des patterns, moitié aléatoires
+
+    Args:
+        n_queries: Nombre de questions
+        responses: Intentions générées
+        sampler: Tirage des mots
+        rng: Générateur aléatoire
+
+    Returns:
+        Liste de questions
+    """
+    patterns = [p for response in responses.values() for p in response["query_patterns"]]
+    queries = []
+    for i in range(n_queries):
+        words = sampler.sample(rng.randint(2, 6))
+        if patterns and i % 2 == 0:
+            words.insert(rng.randint(0, len(words)), rng.choice(patterns))
+        queries.append("Comment " + " ".join(words) + " ?")
+    return queries
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Percentile par interpolation linéaire sur des valeurs triées"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def measure(calls: Sequence[Callable[[], object]]) -> Dict[str, float]:
+    """
+    Exécute une série d'appels et calcule latences et débit
+
+    Args:
+        calls: Appels à chronométrer
+
+    Returns:
+        Statistiques (n, mean_ms, p50_ms, p95_ms, p99_ms, max_ms, throughput_per_s)
+    """
+    latencies = []
+    started = time.perf_counter()
+    for call in calls:
+        t0 = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "n": len(latencies),
+        "mean_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "max_ms": latencies[-1] if latencies else 0.0,
+        "throughput_per_s": len(latencies) / elapsed if elapsed else 0.0
+    }
+
+
+def build_all() -> None:
+    """Charge les fichiers et construit toutes les structures dérivées"""
+    get_index()
+    get_bm25_index()
+    get_team_histogram()
+    get_intent_matcher()
+    data_store.get_document_index()
+
+
+def peak_rss_kb() -> int:
+    """Pic de mémoire résidente du processus (Ko), 0 si indisponible"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS renvoie des octets, Linux des Ko
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_size(n_documents: int, args: argparse.Namespace, workdir: str) -> Dict:
+    """
+    Benchmark complet pour une taille de corpus
+
+    Args:
+        n_documents: Nombre de documents du corpus
+        args: Options de la ligne de commande
+        workdir: Dossier temporaire des fichiers JSON
+
+    Returns:
+        Résultats de la taille
+    """
+    rng = random.Random(args.seed)
+    sampler = ZipfSampler(make_vocabulary(args.vocabulary, rng), rng)
+
+    t0 = time.perf_counter()
+    documents = make_documents(n_documents, sampler, rng)
+    responses = make_responses(args.intents, args.patterns, documents, sampler, rng)
+    queries = make_queries(args.queries, responses, sampler, rng)
+    generation_s = time.perf_counter() - t0
+
+    with open(os.path.join(workdir, "mock_documents.json"), "w", encoding="utf-8") as f:
+        json.dump(documents, f, ensure_ascii=False)
+    with open(os.path.join(workdir, "mock_responses.json"), "w", encoding="utf-8") as f:
+        json.dump(responses, f, ensure_ascii=False)
+    del documents, responses
+
+    data_store.DATA_DIR = workdir
+    data_store.DOCUMENTS_STORE.clear()
+    data_store.RESPONSES_STORE.clear()
+    RESULT_CACHE.clear()
+
+    # Construction à froid : parsing JSON + index + matcher
+    t0 = time.perf_counter()
+    build_all()
+    build_s = time.perf_counter() - t0
+
+    memory = {"peak_rss_kb": peak_rss_kb()}
+    if args.trace_memory:
+        data_store.DOCUMENTS_STORE.clear()
+        data_store.RESPONSES_STORE.clear()
+        tracemalloc.start()
+        build_all()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memory["build_traced_current_bytes"] = current
+        memory["build_traced_peak_bytes"] = peak
+
+    # Sans cache de résultats, on mesure le moteur (maxsize=0 -> toujours un miss)
+    RESULT_CACHE.clear()
+    RESULT_CACHE.maxsize = args.cache_size
+
+    users = [get_user_permissions(name) for name in USERS]
+    operations = {}
+
+    for scoring in SCORING_MODES:
+        operations[f"retrieve_documents[{scoring}]"] = measure([
+            (lambda q=q, p=p: retrieve_documents(q, p, args.top_k, scoring))
+            for q in queries for p in users
+        ])
+
+    operations["generate_response"] = measure([
+        (lambda q=q, p=p: generate_response(q, p))
+        for q in queries for p in users
+    ])
+
+    operations["count_accessible_documents"] = measure([
+        (lambda p=p: count_accessible_documents(p))
+        for _ in range(max(1, args.queries // 10)) for p in users
+    ])
+
+    memory["peak_rss_kb"] = peak_rss_kb()
+
+    return {
+        "n_documents": n_documents,
+        "n_intents": args.intents,
+        "patterns_per_intent": args.patterns,
+        "n_queries": len(queries),
+        "n_users": len(users),
+        "corpus_generation_s": generation_s,
+        "build_s": build_s,
+        "operations": operations,
+        "memory": memory,
+        "result_cache": RESULT_CACHE.stats()
+    }
+
+
+def parse_args(argv: Sequence[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline Mayday Assistant")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000],
+                        help="Tailles de corpus à mesurer (1k à 1M documents)")
+    parser.add_argument("--intents", type=int, default=500, help="Nombre d'intentions")
+    parser.add_argument("--patterns", type=int, default=20, help="Patterns par intention")
+    parser.add_argument("--queries", type=int, default=200, help="Questions par opération et par utilisateur")
+    parser.add_argument("--vocabulary", type=int, default=20000, help="Taille du vocabulaire")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="Taille du cache de résultats pendant la mesure (0 = désactivé)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Mesure le pic d'allocation de la construction avec tracemalloc (lent)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results.json", help="Fichier JSON de sortie")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] = None) -> Dict:
+    args = parse_args(argv)
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args)
+        },
+        "runs": []
+    }
+
+    with tempfile.TemporaryDirectory(prefix="mayday_bench_") as workdir:
+        for n_documents in args.sizes:
+            print(f"[bench] {n_documents} documents...", flush=True)
+            run = run_size(n_documents, args, workdir)
+            results["runs"].append(run)
+            for name, stats in run["operations"].items():
+                print(
+                    f"  {name:<32} p50={stats['p50_ms']:.3f}ms p95={stats['p95_ms']:.3f}ms "
+                    f"p99={stats['p99_ms']:.3f}ms {stats['throughput_per_s']:.0f}/s"
+                )
+            print(f"  build={run['build_s']:.2f}s peak_rss={run['memory']['peak_rss_kb']} Ko")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"[bench] Résultats écrits dans {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Module de scoring BM25
+Statistiques des documents (longueurs par champ, moyennes, IDF) précalculées
+au chargement, fréquences des termes stockées dans des tableaux numériques
+"""
+
+import math
+from array import array
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .inverted_index import rank_scores, tokenize
+from .permissions import TEAM_REGISTRY
+
+# Champs indexés et leur poids dans le score (BM25F simplifié)
+FIELDS = ("keywords", "title", "content")
+DEFAULT_FIELD_WEIGHTS = {"keywords": 3.0, "title": 2.0, "content": 1.0}
+
+
+def _field_terms(document: Dict, field: str) -> List[str]:
+    """
+    Extrait les termes d'un champ du document
+
+    Args:
+        document: Document à découper
+        field: Nom du champ ('keywords', 'title' ou 'content')
+
+    Returns:
+        Liste des termes (avec répétitions)
+    """
+    if field == "keywords":
+        return [kw.lower() for kw in document.get("keywords", [])]
+    return tokenize(document.get(field, ""))
+
+
+class BM25Index:
+    """
+    Index BM25F : une fréquence de terme par champ, normalisée par la
+    longueur du champ rapportée à la longueur moyenne du corpus.
+
+    Postings : terme -> masque d'équipe -> (positions des documents, tf par
+    champ) sous forme de tableaux `array` compacts. Le partitionnement par
+    équipe permet de ne scorer que les documents visibles par l'utilisateur.
+    """
+
+    def __init__(
+        self,
+        documents: Sequence[Dict],
+        k1: float = 1.2,
+        b: float = 0.75,
+        field_weights: Dict[str, float] = None
+    ):
+        """
+        Construit l'index et précalcule les statistiques du corpus
+
+        Args:
+            documents: Documents à indexer (ordre conservé)
+            k1: Saturation de la fréquence des termes
+            b: Force de la normalisation par la longueur
+            field_weights: Poids de chaque champ (par défaut keywords > title > content)
+        """
+        self.documents = documents
+        self.k1 = k1
+        self.b = b
+        self.field_weights = dict(field_weights or DEFAULT_FIELD_WEIGHTS)
+
+        # Longueur de chaque champ par document
+        self.field_lengths: Dict[str, array] = {field: array("I") for field in FIELDS}
+
+        doc_ids: Dict[str, Dict[int, array]] = defaultdict(
+            lambda: defaultdict(lambda: array("I"))
+        )
+        term_freqs: Dict[str, Dict[int, Dict[str, array]]] = defaultdict(
+            lambda: defaultdict(lambda: {field: array("H") for field in FIELDS})
+        )
+        doc_freqs: Dict[str, int] = defaultdict(int)
+
+        for doc_idx, doc in enumerate(documents):
+            team_mask = TEAM_REGISTRY.bit(doc.get("team", ""))
+            counts = {}
+            for field in FIELDS:
+                terms = _field_terms(doc, field)
+                self.field_lengths[field].append(len(terms))
+                counts[field] = Counter(terms)
+
+            for term in set().union(*counts.values()):
+                doc_freqs[term] += 1
+                doc_ids[term][team_mask].append(doc_idx)
+                tfs = term_freqs[term][team_mask]
+                for field in FIELDS:
+                    tfs[field].append(min(counts[field][term], 0xFFFF))
+
+        n_docs = len(documents)
+
+        # Longueurs moyennes par champ
+        self.avg_lengths: Dict[str, float] = {
+            field: (sum(lengths) / n_docs if n_docs else 0.0)
+            for field, lengths in self.field_lengths.items()
+        }
+
+        # Facteurs de normalisation (1 - b + b * len / avg) par champ et par document
+        self.length_norms: Dict[str, array] = {}
+        for field, lengths in self.field_lengths.items():
+            avg = self.avg_lengths[field] or 1.0
+            self.length_norms[field] = array(
+                "d", (1.0 - b + b * length / avg for length in lengths)
+            )
+
+        self.postings: Dict[str, Dict[int, Tuple[array, Dict[str, array]]]] = {
+            term: {
+                team_mask: (ids, term_freqs[term][team_mask])
+                for team_mask, ids in partitions.items()
+            }
+            for term, partitions in doc_ids.items()
+        }
+
+        # Table IDF (variante BM25 toujours positive), sur tout le corpus
+        self.idf: Dict[str, float] = {
+            term: math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            for term, df in doc_freqs.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _term_weights(
+        self,
+        term: str,
+        access_mask: Optional[int] = None
+    ) -> Iterable[Tuple[int, float]]:
+        """
+        Calcule la contribution d'un terme pour chacun de ses documents visibles
+
+        Args:
+            term: Terme de la query
+            access_mask: Masque d'accès (None = tous les documents)
+
+        Returns:
+            Itérable de tuples (position du document, contribution BM25)
+        """
+        partitions = self.postings.get(term)
+        if partitions is None:
+            return ()
+
+        idf = self.idf[term]
+        k1 = self.k1
+        fields = [
+            (field, self.field_weights[field], self.length_norms[field])
+            for field in FIELDS
+            if self.field_weights.get(field)
+        ]
+
+        contributions = []
+        for team_mask, (ids, tfs) in partitions.items():
+            if access_mask is not None and not team_mask & access_mask:
+                continue
+            weighted = [
+                (weight, tfs[field], norms) for field, weight, norms in fields
+            ]
+            for i, doc_idx in enumerate(ids):
+                tf = 0.0
+                for weight, field_tfs, norms in weighted:
+                    field_tf = field_tfs[i]
+                    if field_tf:
+                        tf += weight * field_tf / norms[doc_idx]
+                if tf:
+                    contributions.append((doc_idx, idf * tf / (k1 + tf)))
+        return contributions
+
+    def score(self, query: str, access_mask: Optional[int] = None) -> Dict[int, float]:
+        """
+        Calcule le score BM25 des documents contenant au moins un terme de la query
+
+        Args:
+            query: Question de l'utilisateur
+            access_mask: Masque d'accès de l'utilisateur (None = pas de filtre)
+
+        Returns:
+            Dictionnaire {position du document: score BM25}
+        """
+        return self.score_many([query], access_mask)[0]
+
+    def score_many(
+        self,
+        queries: Sequence[str],
+        access_mask: Optional[int] = None
+    ) -> List[Dict[int, float]]:
+        """
+        Score plusieurs queries en une seule passe sur l'index
+
+        Chaque terme distinct de l'ensemble des queries n'est parcouru
+        qu'une fois ; sa contribution est ensuite ajoutée à toutes les
+        queries qui le contiennent.
+
+        Args:
+            queries: Questions à scorer
+            access_mask: Masque d'accès commun aux queries (None = pas de filtre)
+
+        Returns:
+            Liste de dictionnaires {position du document: score}, dans l'ordre des queries
+        """
+        queries_by_term: Dict[str, List[int]] = defaultdict(list)
+        for query_idx, query in enumerate(queries):
+            for term in set(tokenize(query)):
+                queries_by_term[term].append(query_idx)
+
+        results: List[Dict[int, float]] = [defaultdict(float) for _ in queries]
+        for term, query_ids in queries_by_term.items():
+            for doc_idx, weight in self._term_weights(term, access_mask):
+                for query_idx in query_ids:
+                    results[query_idx][doc_idx] += weight
+
+        return [dict(scores) for scores in results]
+
+    def search(
+        self,
+        query: str,
+        access_mask: Optional[int] = None,
+        top_k: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Retourne les documents qui matchent, triés par score BM25 décroissant
+
+        Args:
+            query: Question de l'utilisateur
+            access_mask: Masque d'accès de l'utilisateur (None = pas de filtre)
+            top_k: Nombre maximum de résultats (None = tous)
+
+        Returns:
+            Liste de tuples (position du document, score)
+        """
+        return self.search_many([query], access_mask, top_k)[0]
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        access_mask: Optional[int] = None,
+        top_k: Optional[int] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Version groupée de `search`
+
+        Args:
+            queries: Questions à scorer
+            access_mask: Masque d'accès commun aux queries (None = pas de filtre)
+            top_k: Nombre maximum de résultats par query (None = tous)
+
+        Returns:
+            Pour chaque query, la liste triée des tuples (position du document, score)
+        """
+        return [
+            rank_scores(scores, top_k)
+            for scores in self.score_many(queries, access_mask)
+        ]
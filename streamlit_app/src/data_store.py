@@ -0,0 +1,243 @@
+"""
+Module de stockage des données mockées
+Charge chaque fichier JSON une seule fois par processus, le recharge si le
+fichier change (mtime/taille) et distribue des vues en lecture seule
+partagées par toutes les sessions Streamlit
+"""
+
+import json
+import os
+import threading
+from types import MappingProxyType
+from typing import (
+    Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+)
+
+from .permissions import TEAM_REGISTRY
+
+# Dossier des fichiers JSON (surchargeable, par exemple pour les benchmarks)
+DATA_DIR = os.environ.get(
+    "MAYDAY_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+)
+
+
+def freeze(value: Any) -> Any:
+    """
+    Convertit récursivement une valeur JSON en vue en lecture seule
+
+    Args:
+        value: Valeur issue de json.load
+
+    Returns:
+        Dictionnaires -> MappingProxyType, listes -> tuples, le reste inchangé
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class JsonFileStore:
+    """
+    Cache process-wide d'un fichier JSON avec invalidation sur changement
+
+    La version du fichier est le couple (mtime_ns, taille). Les structures
+    dérivées (index, tables...) enregistrées via `derive` sont reconstruites
+    automatiquement quand cette version change.
+    """
+
+    def __init__(self, filename: str, empty: Any):
+        """
+        Args:
+            filename: Nom du fichier dans le dossier data/
+            empty: Valeur retournée si le fichier est absent ou invalide
+        """
+        self.filename = filename
+        self.empty = freeze(empty)
+        self._lock = threading.RLock()
+        self._version: Optional[Tuple[int, int]] = None
+        self._data: Any = None
+        self._loaded = False
+        self._derived: Dict[Hashable, Tuple[Optional[Tuple[int, int]], Any]] = {}
+
+    @property
+    def path(self) -> str:
+        return os.path.join(DATA_DIR, self.filename)
+
+    def _stat_version(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load(self) -> Any:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return freeze(json.load(f))
+        except FileNotFoundError:
+            print(f"Erreur : Fichier {self.filename} introuvable")
+            return self.empty
+        except json.JSONDecodeError:
+            print(f"Erreur : Format JSON invalide dans {self.filename}")
+            return self.empty
+
+    def snapshot(self) -> Tuple[Optional[Tuple[int, int]], Any]:
+        """
+        Retourne la version courante du fichier et ses données
+
+        Returns:
+            Tuple (version, données en lecture seule)
+        """
+        version = self._stat_version()
+        with self._lock:
+            if not self._loaded or version != self._version:
+                self._data = self._load() if version is not None else self.empty
+                if version is None:
+                    print(f"Erreur : Fichier {self.filename} introuvable")
+                self._version = version
+                self._loaded = True
+            return self._version, self._data
+
+    def get(self) -> Any:
+        """
+        Retourne les données du fichier (rechargées seulement si modifié)
+
+        Returns:
+            Données en lecture seule
+        """
+        return self.snapshot()[1]
+
+    @property
+    def version(self) -> Optional[Tuple[int, int]]:
+        """Version (mtime_ns, taille) des données actuellement servies"""
+        return self.snapshot()[0]
+
+    def derive(self, key: Hashable, builder: Callable[[Any], Any]) -> Any:
+        """
+        Retourne une structure dérivée des données, recalculée si le fichier change
+
+        Args:
+            key: Identifiant de la structure dérivée
+            builder: Fonction construisant la structure à partir des données
+
+        Returns:
+            Structure dérivée correspondant à la version courante du fichier
+        """
+        with self._lock:
+            version, data = self.snapshot()
+            cached = self._derived.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            value = builder(data)
+            self._derived[key] = (version, value)
+            return value
+
+    def clear(self) -> None:
+        """Oublie les données et structures dérivées (rechargement au prochain accès)"""
+        with self._lock:
+            self._loaded = False
+            self._version = None
+            self._data = None
+            self._derived.clear()
+
+
+# Stores partagés par tout le processus
+DOCUMENTS_STORE = JsonFileStore("mock_documents.json", [])
+RESPONSES_STORE = JsonFileStore("mock_responses.json", {})
+
+
+def get_documents() -> Sequence[Mapping]:
+    """
+    Retourne les documents de la knowledge base (vue en lecture seule)
+
+    Returns:
+        Tuple de documents
+    """
+    return DOCUMENTS_STORE.get()
+
+
+def get_responses() -> Mapping[str, Mapping]:
+    """
+    Retourne les réponses pré-générées (vue en lecture seule)
+
+    Returns:
+        Dictionnaire en lecture seule {clé: réponse}
+    """
+    return RESPONSES_STORE.get()
+
+
+def get_data_version() -> Tuple:
+    """
+    Retourne la version combinée des fichiers de données
+
+    Returns:
+        Tuple (version des documents, version des réponses)
+    """
+    return (DOCUMENTS_STORE.version, RESPONSES_STORE.version)
+
+
+def _build_id_index(
+    documents: Sequence[Mapping]
+) -> Tuple[Mapping[str, Mapping], Mapping[str, int]]:
+    """
+    Construit l'index id -> document (le premier document l'emporte en cas de doublon)
+    et, à côté, le masque d'équipe de chaque document indexé
+
+    Args:
+        documents: Documents du store
+
+    Returns:
+        Tuple de dictionnaires en lecture seule ({id: document}, {id: masque d'équipe})
+    """
+    index: Dict[str, Mapping] = {}
+    team_masks: Dict[str, int] = {}
+    for doc in documents:
+        doc_id = doc.get("id")
+        if doc_id not in index:
+            index[doc_id] = doc
+            team_masks[doc_id] = TEAM_REGISTRY.bit(doc.get("team", ""))
+    return MappingProxyType(index), MappingProxyType(team_masks)
+
+
+def get_document_index() -> Mapping[str, Mapping]:
+    """
+    Retourne l'index des documents par ID, reconstruit si le fichier change
+
+    Returns:
+        Dictionnaire en lecture seule {id: document}
+    """
+    return DOCUMENTS_STORE.derive("id_index", _build_id_index)[0]
+
+
+def get_documents_by_ids(doc_ids: Iterable[str]) -> List[Optional[Mapping]]:
+    """
+    Récupère plusieurs documents par leur ID en une seule fois
+
+    Args:
+        doc_ids: IDs des documents à récupérer
+
+    Returns:
+        Liste alignée sur doc_ids (None pour un ID inconnu)
+    """
+    index = get_document_index()
+    return [index.get(doc_id) for doc_id in doc_ids]
+
+
+def get_documents_with_team_masks(
+    doc_ids: Iterable[str]
+) -> List[Tuple[Optional[Mapping], int]]:
+    """
+    Récupère plusieurs documents par leur ID avec leur masque d'équipe
+
+    Args:
+        doc_ids: IDs des documents à récupérer
+
+    Returns:
+        Liste alignée sur doc_ids de tuples (document, masque d'équipe),
+        (None, 0) pour un ID inconnu
+    """
+    index, team_masks = DOCUMENTS_STORE.derive("id_index", _build_id_index)
+    return [(index.get(doc_id), team_masks.get(doc_id, 0)) for doc_id in doc_ids]
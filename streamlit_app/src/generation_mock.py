@@ -3,51 +3,45 @@ Module de génération de réponses mockées
 Sélectionne et retourne des réponses pré-générées basées sur la query
 """
 
-import json
-import os
-from typing import Dict, Tuple, List, Optional
+import asyncio
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, Tuple, List, Mapping, Optional, Sequence
 
+from .data_store import (
+    RESPONSES_STORE, get_data_version, get_document_index, get_documents,
+    get_documents_with_team_masks, get_responses
+)
+from .pattern_matcher import IntentMatcher
+from .permissions import PUBLIC_TEAMS_MASK, get_team_mask
+from .result_cache import RESULT_CACHE, normalize_query
 
-def load_responses() -> Dict:
+# Types d'événements émis par stream_response
+EVENT_TOKEN = "token"
+EVENT_SOURCES = "sources"
+EVENT_CONFIDENCE = "confidence"
+
+
+def load_responses() -> Mapping[str, Mapping]:
     """
-    Charge les réponses pré-générées depuis le fichier JSON
+    Charge les réponses pré-générées depuis le store partagé
+    
+    Le fichier JSON n'est relu que s'il a changé depuis le dernier accès.
     
     Returns:
-        Dictionnaire des réponses mockées
+        Dictionnaire des réponses mockées (vue en lecture seule)
     """
-    try:
-        current_dir = os.path.dirname(os.path.dirname(__file__))
-        json_path = os.path.join(current_dir, "data", "mock_responses.json")
-        
-        with open(json_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"Erreur : Fichier mock_responses.json introuvable")
-        return {}
-    except json.JSONDecodeError:
-        print(f"Erreur : Format JSON invalide dans mock_responses.json")
-        return {}
+    return get_responses()
 
 
-def load_documents() -> List[Dict]:
+def load_documents() -> Sequence[Mapping]:
     """
-    Charge les documents depuis le fichier JSON
+    Charge les documents depuis le store partagé
     
     Returns:
-        Liste des documents
+        Liste des documents (vue en lecture seule)
     """
-    try:
-        current_dir = os.path.dirname(os.path.dirname(__file__))
-        json_path = os.path.join(current_dir, "data", "mock_documents.json")
-        
-        with open(json_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"Erreur : Fichier mock_documents.json introuvable")
-        return []
-    except json.JSONDecodeError:
-        print(f"Erreur : Format JSON invalide dans mock_documents.json")
-        return []
+    return get_documents()
 
 
 def match_query_pattern(query: str, patterns: List[str]) -> bool:
@@ -65,84 +59,103 @@ def match_query_pattern(query: str, patterns: List[str]) -> bool:
     return any(pattern.lower() in query_lower for pattern in patterns)
 
 
-def get_document_by_id(doc_id: str, documents: List[Dict]) -> Optional[Dict]:
+def get_intent_matcher() -> IntentMatcher:
+    """
+    Retourne le matcher compilé des query_patterns
+    
+    Compilé une seule fois, recompilé automatiquement si mock_responses.json change.
+    
+    Returns:
+        Matcher multi-patterns des intentions
+    """
+    return RESPONSES_STORE.derive("intent_matcher", IntentMatcher)
+
+
+def get_document_by_id(
+    doc_id: str,
+    documents: Optional[Sequence[Mapping]] = None
+) -> Optional[Mapping]:
     """
     Récupère un document par son ID
     
     Args:
         doc_id: ID du document à récupérer
-        documents: Liste de tous les documents
+        documents: Liste de documents à parcourir (optionnel). Si absente,
+            la recherche passe par l'index par ID du store (O(1))
         
     Returns:
         Le document trouvé ou None
     """
+    if documents is None:
+        return get_document_index().get(doc_id)
+    
     for doc in documents:
         if doc.get("id") == doc_id:
             return doc
     return None
 
 
-def generate_response(
+def _match_response(
     query: str,
-    user_permissions: Dict,
-    conversation_history: Optional[List[Dict]] = None
-) -> Tuple[str, List[Dict], str]:
+    team_mask: int
+) -> Tuple[Optional[Mapping], Optional[Tuple[str, List[Dict], str]]]:
     """
-    Génère une réponse mockée basée sur les patterns de query
+    Sélectionne la réponse pré-générée qui matche la query
     
     Args:
         query: Question de l'utilisateur
-        user_permissions: Permissions de l'utilisateur
-        conversation_history: Historique de conversation (optionnel)
+        team_mask: Masque des équipes de l'utilisateur
         
     Returns:
-        Tuple (response_text, sources, confidence_level)
+        Tuple (réponse trouvée, None) ou (None, réponse de repli complète)
+        pour les cas d'erreur, d'accès restreint ou de question inconnue
     """
-    responses = load_responses()
-    documents = load_documents()
+    matcher = get_intent_matcher()
+    responses = matcher.responses
     
     if not responses:
-        return (
+        return None, (
             "Erreur : Impossible de charger les réponses. Veuillez réessayer.",
             [],
             "none"
         )
     
     # 1. Chercher la réponse qui matche la query
+    # (un seul parcours de la query, intentions dans l'ordre du fichier)
     matched_response = None
     matched_key = None
     
-    for key, response_data in responses.items():
-        if match_query_pattern(query, response_data.get("query_patterns", [])):
-            # Vérifier les permissions
-            required_teams = response_data.get("required_teams", [])
-            
-            # Si pas d'équipe requise, c'est public
-            if not required_teams:
-                matched_response = response_data
-                matched_key = key
-                break
-            
-            # Vérifier si l'utilisateur a accès à au moins une équipe
-            user_teams = user_permissions.get("teams", [])
-            if any(team in user_teams for team in required_teams):
-                matched_response = response_data
-                matched_key = key
-                break
-            else:
-                # Pas les permissions nécessaires
-                team_list = ", ".join(required_teams)
-                return (
-                    f"🔒 **Accès restreint**\n\nJe n'ai pas accès à des informations sur ce sujet dans vos documents disponibles.\n\n"
-                    f"Pour cette question, vous devez avoir accès à l'équipe : **{team_list}**\n\n"
-                    f"Contactez votre manager ou l'équipe {required_teams[0]} pour plus d'informations.",
-                    [],
-                    "none"
-                )
+    for key in matcher.find_all(query):
+        response_data = responses[key]
+        
+        # Vérifier les permissions
+        required_teams = response_data.get("required_teams", [])
+        
+        # Si pas d'équipe requise, c'est public
+        if not required_teams:
+            matched_response = response_data
+            matched_key = key
+            break
+        
+        # Vérifier si l'utilisateur a accès à au moins une équipe
+        if get_team_mask(required_teams) & team_mask:
+            matched_response = response_data
+            matched_key = key
+            break
+        else:
+            # Pas les permissions nécessaires
+            team_list = ", ".join(required_teams)
+            return None, (
+                f"🔒 **Accès restreint**\n\nJe n'ai pas accès à des informations sur ce sujet dans vos documents disponibles.\n\n"
+                f"Pour cette question, vous devez avoir accès à l'équipe : **{team_list}**\n\n"
+                f"Contactez votre manager ou l'équipe {required_teams[0]} pour plus d'informations.",
+                [],
+                "none"
+            )
     
     # 2. Si pas de match, réponse par défaut avec suggestions
     if not matched_response:
-        return (
+        return None, (
             """❓ **Question non reconnue**
 
 Je n'ai pas trouvé de réponse exacte à votre question dans ma base de connaissances.
@@ -179,19 +192,30 @@ Je n'ai pas trouvé de réponse exacte à votre question dans ma base de connais
             "low"
         )
     
-    # 3. Récupérer les sources complètes
+    return matched_response, None
+
+
+def _collect_sources(matched_response: Mapping, team_mask: int) -> List[Dict]:
+    """
+    Récupère les sources complètes d'une réponse, filtrées par permissions
+    
+    Args:
+        matched_response: Réponse pré-générée sélectionnée
+        team_mask: Masque des équipes de l'utilisateur
+        
+    Returns:
+        Liste des sources accessibles
+    """
     sources = []
     source_ids = matched_response.get("sources", [])
     
-    for source_id in source_ids:
-        doc = get_document_by_id(source_id, documents)
+    # Équipes de l'utilisateur + équipes publiques
+    access_mask = PUBLIC_TEAMS_MASK | team_mask
+    
+    for doc, doc_mask in get_documents_with_team_masks(source_ids):
         if doc:
-            # Vérifier que l'utilisateur a accès au document
-            doc_team = doc.get("team", "")
-            user_teams = user_permissions.get("teams", [])
-            public_teams = ["Self-Care", "Support", "Academy"]
-            
-            if doc_team in public_teams or doc_team in user_teams:
+            # Vérifier que l'utilisateur a accès au document (ET binaire des masques)
+            if doc_mask & access_mask:
                 sources.append({
                     "id": doc.get("id", ""),
                     "title": doc.get("title", ""),
@@ -202,14 +226,172 @@ Je n'ai pas trouvé de réponse exacte à votre question dans ma base de connais
                     "last_updated": doc.get("last_updated", "")
                 })
     
+    return sources
+
+
+def generate_response(
+    query: str,
+    user_permissions: Dict,
+    conversation_history: Optional[List[Dict]] = None
+) -> Tuple[str, List[Dict], str]:
+    """
+    Génère une réponse mockée basée sur les patterns de query
+    
+    Args:
+        query: Question de l'utilisateur
+        user_permissions: Permissions de l'utilisateur
+        conversation_history: Historique de conversation (optionnel)
+        
+    Returns:
+        Tuple (response_text, sources, confidence_level)
+    """
+    # Résultat partagé entre sessions pour une même query et les mêmes équipes
+    # (le masque de la clé est aussi celui qui filtre la réponse)
+    team_mask = get_team_mask(user_permissions.get("teams", []))
+    key = _cache_key(query, team_mask)
+    version = get_data_version()
+    
+    found, cached = RESULT_CACHE.get(key, version)
+    if not found:
+        cached = _compute_response(query, team_mask)
+        RESULT_CACHE.put(key, cached, version)
+    
+    text, sources, confidence = cached
+    return text, [dict(source) for source in sources], confidence
+
+
+def _cache_key(query: str, team_mask: int) -> Tuple:
+    """
+    Construit la clé de cache d'une réponse
+    
+    Args:
+        query: Question de l'utilisateur
+        team_mask: Masque des équipes de l'utilisateur
+        
+    Returns:
+        Tuple (espace de noms, query normalisée, masque des équipes)
+    """
+    return ("generate_response", normalize_query(query), team_mask)
+
+
+def _compute_response(query: str, team_mask: int) -> Tuple[str, Tuple[Dict, ...], str]:
+    """
+    Calcule une réponse complète (sans passer par le cache)
+    
+    Args:
+        query: Question de l'utilisateur
+        team_mask: Masque des équipes de l'utilisateur
+        
+    Returns:
+        Tuple (response_text, sources, confidence_level)
+    """
+    # 1-2. Chercher la réponse qui matche la query (ou la réponse de repli)
+    matched_response, fallback = _match_response(query, team_mask)
+    if fallback is not None:
+        text, sources, confidence = fallback
+        return text, tuple(sources), confidence
+    
+    # 3. Récupérer les sources complètes
+    sources = _collect_sources(matched_response, team_mask)
+    
     # 4. Retourner la réponse avec ses sources et score de confiance
     return (
         matched_response.get("response", ""),
-        sources,
+        tuple(sources),
         matched_response.get("confidence", "medium")
     )
 
 
+def split_response_chunks(text: str) -> List[str]:
+    """
+    Découpe un texte de réponse en chunks (un mot et ses espaces)
+    
+    Args:
+        text: Texte de la réponse
+        
+    Returns:
+        Liste de chunks dont la concaténation redonne le texte
+    """
+    return re.findall(r"\s+|\S+\s*", text)
+
+
+def stream_response(
+    query: str,
+    user_permissions: Dict,
+    conversation_history: Optional[List[Dict]] = None,
+    chunk_delay: float = 0.0
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Génère une réponse mockée sous forme de flux d'événements
+    
+    Le texte est émis chunk par chunk dès que la réponse est sélectionnée ;
+    les sources et le niveau de confiance arrivent en fin de flux.
+    
+    Args:
+        query: Question de l'utilisateur
+        user_permissions: Permissions de l'utilisateur
+        conversation_history: Historique de conversation (optionnel)
+        chunk_delay: Pause entre deux chunks en secondes (effet de frappe)
+        
+    Yields:
+        Tuples (type d'événement, contenu) :
+        ("token", str), puis ("sources", list) et ("confidence", str)
+    """
+    team_mask = get_team_mask(user_permissions.get("teams", []))
+    key = _cache_key(query, team_mask)
+    version = get_data_version()
+    found, cached = RESULT_CACHE.get(key, version)
+    
+    if found:
+        text, sources, confidence = cached
+        matched_response, fallback = None, None
+    else:
+        matched_response, fallback = _match_response(query, team_mask)
+        if fallback is not None:
+            text, sources, confidence = fallback
+        else:
+            text = matched_response.get("response", "")
+    
+    for chunk in split_response_chunks(text):
+        yield EVENT_TOKEN, chunk
+        if chunk_delay:
+            time.sleep(chunk_delay)
+    
+    # Événements de fin : sources puis confiance
+    if matched_response is not None:
+        sources = _collect_sources(matched_response, team_mask)
+        confidence = matched_response.get("confidence", "medium")
+    
+    if not found:
+        RESULT_CACHE.put(key, (text, tuple(sources), confidence), version)
+    
+    yield EVENT_SOURCES, [dict(source) for source in sources]
+    yield EVENT_CONFIDENCE, confidence
+
+
+async def astream_response(
+    query: str,
+    user_permissions: Dict,
+    conversation_history: Optional[List[Dict]] = None,
+    chunk_delay: float = 0.0
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Version asynchrone de `stream_response`
+    
+    Args:
+        query: Question de l'utilisateur
+        user_permissions: Permissions de l'utilisateur
+        conversation_history: Historique de conversation (optionnel)
+        chunk_delay: Pause entre deux chunks en secondes
+        
+    Yields:
+        Les mêmes événements que `stream_response`
+    """
+    for event in stream_response(query, user_permissions, conversation_history):
+        yield event
+        await asyncio.sleep(chunk_delay)
+
+
 def get_available_questions() -> Dict[str, List[str]]:
     """
     Retourne la liste des questions disponibles par catégorie
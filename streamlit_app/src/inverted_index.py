@@ -0,0 +1,178 @@
+"""
+Module d'index inversé
+Indexe les termes des documents (keywords, titre, contenu) une seule fois
+pour que chaque query ne parcoure que les postings de ses propres termes
+"""
+
+import heapq
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .permissions import TEAM_REGISTRY
+
+# Champs dans lesquels un terme apparaît (masque de bits)
+FIELD_KEYWORD = 1
+FIELD_TITLE = 2
+FIELD_CONTENT = 4
+
+
+def rank_scores(
+    scores: Dict[int, float],
+    top_k: Optional[int] = None
+) -> List[Tuple[int, float]]:
+    """
+    Classe des scores par ordre décroissant (ordre du fichier à score égal)
+
+    Args:
+        scores: Dictionnaire {position du document: score}
+        top_k: Nombre maximum de résultats (tas borné) ; None = tri complet
+
+    Returns:
+        Liste de tuples (position du document, score)
+    """
+    def key(item):
+        return (-item[1], item[0])
+
+    if top_k is None:
+        return sorted(scores.items(), key=key)
+    return heapq.nsmallest(top_k, scores.items(), key=key)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Découpe un texte en termes, comme le fait le matching par mots-clés
+
+    Args:
+        text: Texte à découper
+
+    Returns:
+        Liste des termes en minuscules
+    """
+    return text.lower().split()
+
+
+class InvertedIndex:
+    """
+    Index inversé terme -> équipe -> postings (position du document, champs)
+
+    Les postings de chaque terme sont partitionnés par masque d'équipe :
+    une query filtrée par permissions ne parcourt que les partitions
+    visibles par l'utilisateur.
+
+    Les scores produits sont identiques à ceux de `match_keywords` :
+    ratio de mots de la query présents dans le document, plus un bonus
+    de 0.3 pondéré par la proportion de keywords du document qui matchent.
+    """
+
+    def __init__(self, documents: Sequence[Dict]):
+        """
+        Construit l'index à partir de la liste des documents
+
+        Args:
+            documents: Documents à indexer (ordre conservé)
+        """
+        self.documents = documents
+        # Nombre de keywords distincts par document (dénominateur du bonus)
+        self.keyword_counts: List[int] = []
+
+        postings: Dict[str, Dict[int, List[Tuple[int, int]]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        for doc_idx, doc in enumerate(documents):
+            team_mask = TEAM_REGISTRY.bit(doc.get("team", ""))
+
+            doc_keywords = set(kw.lower() for kw in doc.get("keywords", []))
+            self.keyword_counts.append(len(doc_keywords))
+
+            fields: Dict[str, int] = defaultdict(int)
+            for term in doc_keywords:
+                fields[term] |= FIELD_KEYWORD
+            for term in tokenize(doc.get("title", "")):
+                fields[term] |= FIELD_TITLE
+            for term in tokenize(doc.get("content", "")):
+                fields[term] |= FIELD_CONTENT
+
+            for term, mask in fields.items():
+                postings[term][team_mask].append((doc_idx, mask))
+
+        self.postings: Dict[str, Dict[int, List[Tuple[int, int]]]] = {
+            term: dict(partitions) for term, partitions in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _postings(self, term: str, access_mask: Optional[int]) -> Iterable[Tuple[int, int]]:
+        """
+        Itère sur les postings d'un terme visibles avec un masque d'accès
+
+        Args:
+            term: Terme de la query
+            access_mask: Masque d'accès (None = tous les documents)
+
+        Returns:
+            Itérable de tuples (position du document, champs)
+        """
+        for team_mask, postings in self.postings.get(term, {}).items():
+            if access_mask is None or team_mask & access_mask:
+                yield from postings
+
+    def score(self, query: str, access_mask: Optional[int] = None) -> Dict[int, float]:
+        """
+        Calcule le score des documents contenant au moins un terme de la query
+
+        Les documents non visibles avec `access_mask` ne sont jamais scorés.
+
+        Args:
+            query: Question de l'utilisateur
+            access_mask: Masque d'accès de l'utilisateur (None = pas de filtre)
+
+        Returns:
+            Dictionnaire {position du document: score entre 0 et 1}
+        """
+        query_words = set(tokenize(query))
+        if not query_words:
+            return {}
+
+        common: Dict[int, int] = defaultdict(int)
+        keyword_matches: Dict[int, int] = defaultdict(int)
+
+        for term in query_words:
+            for doc_idx, mask in self._postings(term, access_mask):
+                common[doc_idx] += 1
+                if mask & FIELD_KEYWORD:
+                    keyword_matches[doc_idx] += 1
+
+        scores = {}
+        for doc_idx, n_common in common.items():
+            score = n_common / len(query_words)
+
+            n_keywords = keyword_matches.get(doc_idx, 0)
+            if n_keywords:
+                score += 0.3 * (n_keywords / self.keyword_counts[doc_idx])
+
+            scores[doc_idx] = min(score, 1.0)
+
+        return scores
+
+    def search(
+        self,
+        query: str,
+        access_mask: Optional[int] = None,
+        top_k: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Retourne les documents qui matchent, triés par score décroissant
+
+        À score égal, l'ordre du fichier est conservé (comme un tri stable
+        sur la liste complète des documents).
+
+        Args:
+            query: Question de l'utilisateur
+            access_mask: Masque d'accès de l'utilisateur (None = pas de filtre)
+            top_k: Nombre maximum de résultats (None = tous)
+
+        Returns:
+            Liste de tuples (position du document, score)
+        """
+        return rank_scores(self.score(query, access_mask), top_k)
@@ -0,0 +1,140 @@
+"""
+Module de matching multi-patterns (automate d'Aho-Corasick)
+Compile une seule fois les query_patterns de toutes les réponses et trouve
+toutes les intentions qui matchent en un seul parcours de la query
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+
+class PatternMatcher:
+    """
+    Automate d'Aho-Corasick sur les patterns en minuscules
+
+    Chaque pattern est associé à la position de son intention (ordre du
+    fichier de réponses). Un pattern matche s'il est une sous-chaîne de la
+    query en minuscules, comme dans `match_query_pattern`.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, int]]):
+        """
+        Construit l'automate
+
+        Args:
+            patterns: Couples (pattern, position de l'intention)
+        """
+        # Transitions, liens d'échec et sorties par état (état 0 = racine)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Set[int]] = [set()]
+        # Intentions dont un pattern est vide : elles matchent toute query
+        self._always: Set[int] = set()
+
+        for pattern, intent in patterns:
+            pattern = pattern.lower()
+            if not pattern:
+                self._always.add(intent)
+                continue
+
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(set())
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state].add(intent)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        """Calcule les liens d'échec par parcours en largeur"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def find_all(self, query: str) -> List[int]:
+        """
+        Trouve toutes les intentions dont au moins un pattern apparaît dans la query
+
+        Args:
+            query: Question de l'utilisateur
+
+        Returns:
+            Positions des intentions qui matchent, dans l'ordre du fichier
+        """
+        matches = set(self._always)
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        state = 0
+        for char in query.lower().strip():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                matches |= output[state]
+
+        return sorted(matches)
+
+    def first_match(self, query: str) -> Optional[int]:
+        """
+        Retourne la première intention (ordre du fichier) qui matche la query
+
+        Args:
+            query: Question de l'utilisateur
+
+        Returns:
+            Position de l'intention ou None
+        """
+        matches = self.find_all(query)
+        return matches[0] if matches else None
+
+
+class IntentMatcher:
+    """
+    Matcher compilé à partir du fichier de réponses
+
+    Conserve les clés des intentions dans l'ordre du fichier pour appliquer
+    la sémantique « premier match dans l'ordre du fichier ».
+    """
+
+    def __init__(self, responses: Mapping[str, Mapping]):
+        """
+        Args:
+            responses: Réponses mockées {clé: réponse}
+        """
+        self.responses = responses
+        self.keys: List[str] = list(responses.keys())
+        self.matcher = PatternMatcher(
+            (pattern, intent)
+            for intent, key in enumerate(self.keys)
+            for pattern in responses[key].get("query_patterns", [])
+        )
+
+    def find_all(self, query: str) -> List[str]:
+        """
+        Retourne les clés de toutes les intentions qui matchent, dans l'ordre du fichier
+
+        Args:
+            query: Question de l'utilisateur
+
+        Returns:
+            Liste des clés de réponses
+        """
+        return [self.keys[intent] for intent in self.matcher.find_all(query)]
@@ -3,7 +3,12 @@ Module de gestion des permissions utilisateur
 Définit les utilisateurs et leurs droits d'accès aux documents
 """
 
-from typing import Dict
+import threading
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, Mapping
+
+# Équipes dont les documents sont accessibles à tous
+PUBLIC_TEAMS = ["Self-Care", "Support", "Academy"]
 
 # Définition des utilisateurs et leurs permissions
 USERS: Dict[str, Dict] = {
@@ -60,3 +65,143 @@ def has_team_access(user_permissions: Dict, required_teams: list) -> bool:
     
     user_teams = user_permissions.get("teams", [])
     return any(team in user_teams for team in required_teams)
+
+
+class TeamRegistry:
+    """
+    Associe chaque équipe à une position de bit (internement)
+    
+    Un ensemble d'équipes devient un masque entier : la visibilité d'un
+    document se réduit alors à un ET binaire.
+    """
+    
+    def __init__(self):
+        self._bits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def bit(self, team: str) -> int:
+        """
+        Retourne le masque (un seul bit) d'une équipe, en l'internant si besoin
+        
+        Args:
+            team: Nom de l'équipe
+            
+        Returns:
+            Masque de l'équipe
+        """
+        bit = self._bits.get(team)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.setdefault(team, 1 << len(self._bits))
+        return bit
+    
+    def mask(self, teams: Iterable[str]) -> int:
+        """
+        Calcule le masque d'un ensemble d'équipes
+        
+        Args:
+            teams: Noms des équipes
+            
+        Returns:
+            OU binaire des bits des équipes
+        """
+        mask = 0
+        for team in teams:
+            mask |= self.bit(team)
+        return mask
+
+
+# Registre partagé par tout le processus
+TEAM_REGISTRY = TeamRegistry()
+PUBLIC_TEAMS_MASK = TEAM_REGISTRY.mask(PUBLIC_TEAMS)
+
+# Masques déjà calculés, par ensemble d'équipes (les bits ne changent jamais)
+_team_masks: Dict[FrozenSet[str], int] = {}
+
+
+def get_team_mask(teams: Iterable[str]) -> int:
+    """
+    Calcule le masque binaire d'une liste d'équipes
+    
+    Args:
+        teams: Noms des équipes
+        
+    Returns:
+        Masque des équipes
+    """
+    key = frozenset(teams)
+    mask = _team_masks.get(key)
+    if mask is None:
+        mask = _team_masks.setdefault(key, TEAM_REGISTRY.mask(key))
+    return mask
+
+
+def get_access_mask(user_permissions: Dict) -> int:
+    """
+    Calcule le masque des équipes dont l'utilisateur peut voir les documents
+    
+    Args:
+        user_permissions: Permissions de l'utilisateur
+        
+    Returns:
+        Masque des équipes de l'utilisateur + équipes publiques
+    """
+    return PUBLIC_TEAMS_MASK | get_team_mask(user_permissions.get("teams", []))
+
+
+def team_histogram(documents: Iterable[Mapping]) -> Counter:
+    """
+    Compte les documents par masque d'équipe
+    
+    Args:
+        documents: Documents de la knowledge base
+        
+    Returns:
+        Nombre de documents par masque d'équipe
+    """
+    return Counter(TEAM_REGISTRY.bit(doc.get("team", "")) for doc in documents)
+
+
+class AccessibleCountCache:
+    """
+    Nombre de documents accessibles par masque d'accès
+    
+    L'histogramme des documents par équipe n'a qu'une entrée par équipe :
+    un compteur se calcule en parcourant ces entrées, pas le corpus. Les
+    compteurs sont oubliés quand un nouvel histogramme est appliqué.
+    """
+    
+    def __init__(self):
+        self._histogram: Counter = Counter()
+        self._counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+    
+    def refresh(self, histogram: Counter) -> None:
+        """
+        Applique un nouvel histogramme des documents par équipe
+        
+        Args:
+            histogram: Nombre de documents par masque d'équipe
+        """
+        with self._lock:
+            self._histogram = Counter(histogram)
+            self._counts.clear()
+    
+    def count(self, access_mask: int) -> int:
+        """
+        Retourne le nombre de documents visibles avec un masque d'accès
+        
+        Args:
+            access_mask: Masque d'accès de l'utilisateur
+            
+        Returns:
+            Nombre de documents accessibles
+        """
+        with self._lock:
+            count = self._counts.get(access_mask)
+            if count is None:
+                count = sum(
+                    n for team_mask, n in self._histogram.items() if team_mask & access_mask
+                )
+                self._counts[access_mask] = count
+            return count
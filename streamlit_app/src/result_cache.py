@@ -0,0 +1,155 @@
+"""
+Module de cache des résultats
+Cache LRU/TTL partagé par toutes les sessions Streamlit du processus,
+indexé par (query normalisée, masque d'équipes, version des données)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalise une query pour la clé de cache
+
+    Même normalisation que le matching des patterns (minuscules, espaces
+    de début et de fin retirés), pour que deux queries de même clé
+    produisent toujours le même résultat.
+
+    Args:
+        query: Question de l'utilisateur
+
+    Returns:
+        Query normalisée
+    """
+    return query.lower().strip()
+
+
+class ResultCache:
+    """
+    Cache LRU avec expiration (TTL) et compteurs de hits/misses
+
+    Toutes les entrées sont invalidées dès que la version des données
+    (fichiers JSON) change.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            maxsize: Nombre maximum d'entrées conservées
+            ttl: Durée de vie d'une entrée en secondes
+            clock: Horloge utilisée pour l'expiration
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._version: Any = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _check_version(self, version: Any) -> None:
+        """Vide le cache si la version des données a changé (verrou déjà pris)"""
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: Hashable, version: Any = None) -> Tuple[bool, Any]:
+        """
+        Cherche une entrée du cache
+
+        Args:
+            key: Clé de l'entrée
+            version: Version courante des données
+
+        Returns:
+            Tuple (trouvé, valeur)
+        """
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any, version: Any = None) -> None:
+        """
+        Ajoute ou remplace une entrée (éviction LRU si le cache est plein)
+
+        Args:
+            key: Clé de l'entrée
+            value: Valeur à mettre en cache
+            version: Version des données ayant produit la valeur
+        """
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        version: Any = None
+    ) -> Any:
+        """
+        Retourne la valeur en cache ou la calcule puis la met en cache
+
+        Args:
+            key: Clé de l'entrée
+            compute: Fonction calculant la valeur en cas de miss
+            version: Version courante des données
+
+        Returns:
+            Valeur (en cache ou calculée)
+        """
+        found, value = self.get(key, version)
+        if not found:
+            value = compute()
+            self.put(key, value, version)
+        return value
+
+    def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les statistiques du cache
+
+        Returns:
+            Dictionnaire (hits, misses, hit_rate, size, maxsize, ttl)
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl
+            }
+
+
+# Cache partagé par toutes les sessions du processus
+RESULT_CACHE = ResultCache()
@@ -3,31 +3,104 @@ Module de retrieval mock (simulation)
 Simule un système de retrieval en matchant par mots-clés
 """
 
-import json
-import os
-from typing import List, Dict
+from collections import Counter
+from typing import List, Dict, Mapping, Sequence
 
+from .bm25 import BM25Index
+from .data_store import DOCUMENTS_STORE, get_data_version, get_documents
+from .inverted_index import InvertedIndex
+from .permissions import AccessibleCountCache, get_access_mask, team_histogram
+from .result_cache import RESULT_CACHE, normalize_query
 
-def load_documents() -> List[Dict]:
+# Modes de scoring disponibles
+SCORING_KEYWORDS = "keywords"
+SCORING_BM25 = "bm25"
+SCORING_MODES = (SCORING_KEYWORDS, SCORING_BM25)
+
+# Nombre de documents accessibles par masque d'accès (partagé par les sessions)
+_accessible_counts = AccessibleCountCache()
+
+
+def load_documents() -> Sequence[Mapping]:
+    """
+    Charge les documents depuis le store partagé
+    
+    Le fichier JSON n'est relu que s'il a changé depuis le dernier accès.
+    
+    Returns:
+        Liste des documents (vue en lecture seule)
+    """
+    return get_documents()
+
+
+def get_index() -> InvertedIndex:
+    """
+    Retourne l'index inversé des documents
+    
+    Construit une seule fois, reconstruit si mock_documents.json change.
+    
+    Returns:
+        Index inversé partagé par toutes les queries
+    """
+    return DOCUMENTS_STORE.derive("inverted_index", InvertedIndex)
+
+
+def get_bm25_index() -> BM25Index:
     """
-    Charge les documents depuis le fichier JSON
+    Retourne l'index BM25 des documents
+    
+    Construit une seule fois, reconstruit si mock_documents.json change.
     
     Returns:
-        Liste des documents
+        Index BM25 avec ses statistiques précalculées
     """
-    try:
-        # Chemin relatif au fichier
-        current_dir = os.path.dirname(os.path.dirname(__file__))
-        json_path = os.path.join(current_dir, "data", "mock_documents.json")
+    return DOCUMENTS_STORE.derive("bm25_index", BM25Index)
+
+
+def _build_team_histogram(documents: Sequence[Mapping]) -> Counter:
+    """
+    Compte les documents par équipe et réinitialise les compteurs d'accès
+    
+    Args:
+        documents: Documents du store
         
-        with open(json_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"Erreur : Fichier mock_documents.json introuvable")
-        return []
-    except json.JSONDecodeError:
-        print(f"Erreur : Format JSON invalide dans mock_documents.json")
-        return []
+    Returns:
+        Nombre de documents par masque d'équipe
+    """
+    histogram = team_histogram(documents)
+    _accessible_counts.refresh(histogram)
+    return histogram
+
+
+def get_team_histogram() -> Counter:
+    """
+    Retourne le nombre de documents par masque d'équipe
+    
+    Recalculé (et compteurs réinitialisés) si mock_documents.json change.
+    
+    Returns:
+        Histogramme des documents par masque d'équipe
+    """
+    return DOCUMENTS_STORE.derive("team_histogram", _build_team_histogram)
+
+
+def _get_scoring_index(scoring: str):
+    """
+    Sélectionne l'index correspondant au mode de scoring
+    
+    Args:
+        scoring: Mode de scoring ('keywords' ou 'bm25')
+        
+    Returns:
+        Index exposant search() / documents
+    """
+    if scoring == SCORING_KEYWORDS:
+        return get_index()
+    if scoring == SCORING_BM25:
+        return get_bm25_index()
+    raise ValueError(
+        f"Mode de scoring inconnu : {scoring!r} (attendu : {', '.join(SCORING_MODES)})"
+    )
 
 
 def match_keywords(query: str, document: Dict) -> float:
@@ -75,54 +148,104 @@ def match_keywords(query: str, document: Dict) -> float:
     return min(score, 1.0)
 
 
+def _build_results(
+    ranked: List,
+    documents: Sequence[Mapping]
+) -> List[Dict]:
+    """
+    Construit les résultats à partir d'une liste classée de documents
+    
+    Args:
+        ranked: Tuples (position du document, score) triés par score décroissant
+        documents: Documents indexés
+        
+    Returns:
+        Liste des documents avec leur score
+    """
+    return [
+        {
+            **documents[doc_idx],
+            "score": score
+        }
+        for doc_idx, score in ranked
+    ]
+
+
 def retrieve_documents(
     query: str,
     user_permissions: Dict,
-    top_k: int = 5
+    top_k: int = 5,
+    scoring: str = SCORING_KEYWORDS
 ) -> List[Dict]:
     """
-    Simule un retrieval en matchant les mots-clés puis filtre par permissions
+    Simule un retrieval en matchant les mots-clés parmi les documents accessibles
+    
+    Le filtre par permissions est appliqué avant le scoring : seules les
+    partitions de l'index visibles par l'utilisateur sont parcourues, et le
+    top_k est extrait avec un tas borné.
     
     Args:
         query: Question de l'utilisateur
         user_permissions: Permissions de l'utilisateur (teams, role, etc.)
         top_k: Nombre maximum de documents à retourner
+        scoring: Mode de scoring ('keywords' = ratio de mots communs, 'bm25')
         
     Returns:
         Liste des documents les plus pertinents et accessibles
     """
-    documents = load_documents()
+    index = _get_scoring_index(scoring)
     
-    if not documents:
+    if not len(index):
         return []
     
-    # 1. Calculer les scores pour tous les documents
-    scored_docs = []
-    for doc in documents:
-        score = match_keywords(query, doc)
-        if score > 0:
-            scored_docs.append({
-                **doc,
-                "score": score
-            })
-    
-    # 2. Filtrer par permissions (vérifier que l'équipe est dans les permissions)
-    user_teams = user_permissions.get("teams", [])
-    filtered_docs = []
-    
-    for doc in scored_docs:
-        doc_team = doc.get("team", "")
-        
-        # Documents publics (Self-Care, Support, Academy accessibles à tous)
-        public_teams = ["Self-Care", "Support", "Academy"]
+    # 1. Masque des équipes de l'utilisateur + équipes publiques
+    access_mask = get_access_mask(user_permissions)
+    
+    # 2. Scorer uniquement les postings visibles des termes de la query, garder le top_k
+    # (résultat partagé entre sessions pour une même query et le même masque)
+    key = ("retrieve_documents", normalize_query(query), access_mask, top_k, scoring)
+    results = RESULT_CACHE.get_or_compute(
+        key,
+        lambda: tuple(_build_results(index.search(query, access_mask, top_k), index.documents)),
+        get_data_version()
+    )
+    
+    return [dict(doc) for doc in results]
+
+
+def retrieve_documents_batch(
+    queries: List[str],
+    user_permissions: Dict,
+    top_k: int = 5,
+    scoring: str = SCORING_BM25
+) -> List[List[Dict]]:
+    """
+    Retrieval groupé : score toutes les queries en une passe sur l'index
+    
+    En mode BM25, chaque terme distinct des queries n'est parcouru qu'une fois.
+    
+    Args:
+        queries: Questions des utilisateurs
+        user_permissions: Permissions communes aux queries
+        top_k: Nombre maximum de documents par query
+        scoring: Mode de scoring ('keywords' ou 'bm25')
         
-        if doc_team in public_teams or doc_team in user_teams:
-            filtered_docs.append(doc)
+    Returns:
+        Pour chaque query, la liste des documents pertinents et accessibles
+    """
+    index = _get_scoring_index(scoring)
+    
+    if not len(index):
+        return [[] for _ in queries]
     
-    # 3. Trier par score décroissant et limiter au top_k
-    filtered_docs.sort(key=lambda x: x["score"], reverse=True)
+    access_mask = get_access_mask(user_permissions)
     
-    return filtered_docs[:top_k]
+    if scoring == SCORING_BM25:
+        all_ranked = index.search_many(queries, access_mask, top_k)
+    else:
+        all_ranked = [index.search(query, access_mask, top_k) for query in queries]
+    
+    return [_build_results(ranked, index.documents) for ranked in all_ranked]
 
 
 def count_accessible_documents(user_permissions: Dict) -> int:
@@ -135,14 +258,7 @@ def count_accessible_documents(user_permissions: Dict) -> int:
     Returns:
         Nombre de documents accessibles
     """
-    documents = load_documents()
-    user_teams = user_permissions.get("teams", [])
-    public_teams = ["Self-Care", "Support", "Academy"]
-    
-    accessible_count = 0
-    for doc in documents:
-        doc_team = doc.get("team", "")
-        if doc_team in public_teams or doc_team in user_teams:
-            accessible_count += 1
+    # S'assure que les compteurs correspondent à la version courante des documents
+    get_team_histogram()
     
-    return accessible_count
+    return _accessible_counts.count(get_access_mask(user_permissions))